@@ -31,6 +31,8 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 DATABASE_CONN_STRING = os.getenv("DATABASE_CONN_STRING")
 VECTOR_TABLE_NAME = os.getenv("VECTOR_TABLE_NAME") or "documents"
+# HNSW search breadth for similarity search (pgvector hnsw.ef_search)
+VECTOR_EF_SEARCH = int(os.getenv("VECTOR_EF_SEARCH") or "40")
 
 # Azure Storage Configuration (Central US region)
 AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
@@ -38,5 +40,8 @@ AZURE_STORAGE_CONTAINER_NAME = os.getenv("AZURE_STORAGE_CONTAINER_NAME") or "doc
 AZURE_STORAGE_ACCOUNT_NAME = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
 
 
+# Local directory watched for new documents (file_watcher)
+MONITORED_DIR = os.getenv("MONITORED_DIR") or "monitored_data"
+
 # Deployment Configuration
 RUN_WORKER_EMBEDDED = os.getenv("RUN_WORKER_EMBEDDED", "false").lower() == "true"
@@ -1,9 +1,30 @@
+import asyncio
 import logging
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
 from services.supabase_service import supabase_service
 
 logger = logging.getLogger(__name__)
 
+# Most recently used summaries, keyed by filename -> (fetched_at, summary).
+# The TTL bounds staleness when another process writes summaries.
+SUMMARY_CACHE_SIZE = 512
+SUMMARY_CACHE_TTL = 60.0
+_summary_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+# Short-lived (fetched_at, summaries) snapshot so bursts of history reads share a query
+SUMMARY_LIST_CACHE_TTL = 10.0
+# History listings only show which files have summaries; the text is fetched per file
+SUMMARY_LIST_COLUMNS = "id, filename, created_at"
+_all_summaries_cache: tuple[float, list[dict]] | None = None
+
+# Guards both caches; the async wrappers call into this module from worker threads.
+# The generation is bumped on every invalidation so a read that started before a
+# save does not cache the pre-save result.
+_summary_cache_lock = threading.Lock()
+_summary_cache_generation = 0
+
 
 def init_db() -> None:
     """
@@ -28,10 +49,19 @@ def init_db() -> None:
         logger.error(f"Failed to verify Supabase connection: {e}")
 
 
+def _invalidate_summary_caches(*filenames: str) -> None:
+    global _all_summaries_cache, _summary_cache_generation
+    with _summary_cache_lock:
+        for filename in filenames:
+            _summary_cache.pop(filename, None)
+        _all_summaries_cache = None
+        _summary_cache_generation += 1
+
+
 def save_summary(filename: str, summary_text: str) -> None:
     """
     Save or update a document summary in Supabase.
-    Uses upsert to handle both insert and update cases.
+    Uses upsert to handle both insert and update cases; created_at is set by the database.
     """
     try:
         if not supabase_service.client:
@@ -44,11 +74,12 @@ def save_summary(filename: str, summary_text: str) -> None:
                 {
                     "filename": filename,
                     "summary_text": summary_text,
-                    "created_at": datetime.now().isoformat(),
-                }
+                },
+                on_conflict="filename",
             )
             .execute()
         )
+        _invalidate_summary_caches(filename)
 
         if response.data:
             logger.info(f"Summary saved for {filename}")
@@ -59,10 +90,43 @@ def save_summary(filename: str, summary_text: str) -> None:
         raise
 
 
+def save_summaries_bulk(summaries: dict[str, str]) -> None:
+    """
+    Save or update many summaries, keyed by filename, in a single upsert request.
+    """
+    if not summaries:
+        return
+
+    try:
+        if not supabase_service.client:
+            logger.warning("Supabase client not initialized, cannot save summaries")
+            return
+
+        rows = [
+            {"filename": filename, "summary_text": summary_text}
+            for filename, summary_text in summaries.items()
+        ]
+        supabase_service.client.table("summaries").upsert(rows, on_conflict="filename").execute()
+        _invalidate_summary_caches(*summaries)
+        logger.info(f"Saved {len(rows)} summaries")
+    except Exception as e:
+        logger.error(f"Failed to save {len(summaries)} summaries: {e}")
+        raise
+
+
 def get_summary(filename: str) -> dict | None:
     """
     Retrieve a summary by filename from Supabase.
+    Found summaries are cached in-process for SUMMARY_CACHE_TTL seconds, or until
+    save_summary replaces them.
     """
+    with _summary_cache_lock:
+        cached = _summary_cache.get(filename)
+        if cached is not None and time.monotonic() - cached[0] < SUMMARY_CACHE_TTL:
+            _summary_cache.move_to_end(filename)
+            return dict(cached[1])
+        generation = _summary_cache_generation
+
     try:
         if not supabase_service.client:
             logger.warning("Supabase client not initialized, cannot retrieve summary")
@@ -76,7 +140,14 @@ def get_summary(filename: str) -> dict | None:
         )
 
         if response.data and len(response.data) > 0:
-            return response.data[0]
+            summary = response.data[0]
+            with _summary_cache_lock:
+                if generation == _summary_cache_generation:
+                    _summary_cache[filename] = (time.monotonic(), summary)
+                    _summary_cache.move_to_end(filename)
+                    if len(_summary_cache) > SUMMARY_CACHE_SIZE:
+                        _summary_cache.popitem(last=False)
+            return dict(summary)
         return None
     except Exception as e:
         logger.error(f"Failed to get summary for {filename}: {e}")
@@ -86,7 +157,16 @@ def get_summary(filename: str) -> dict | None:
 def get_all_summaries() -> list[dict]:
     """
     Retrieve all summaries ordered by creation date from Supabase.
+    Only SUMMARY_LIST_COLUMNS are returned; use get_summary for the summary text.
+    Results are reused for SUMMARY_LIST_CACHE_TTL seconds, or until save_summary.
     """
+    global _all_summaries_cache
+    with _summary_cache_lock:
+        cached = _all_summaries_cache
+        if cached is not None and time.monotonic() - cached[0] < SUMMARY_LIST_CACHE_TTL:
+            return list(cached[1])
+        generation = _summary_cache_generation
+
     try:
         if not supabase_service.client:
             logger.warning("Supabase client not initialized, cannot retrieve summaries")
@@ -94,15 +174,38 @@ def get_all_summaries() -> list[dict]:
 
         response = (
             supabase_service.client.table("summaries")
-            .select("*")
+            .select(SUMMARY_LIST_COLUMNS)
             .order("created_at", desc=True)
             .execute()
         )
 
-        if response.data:
-            logger.info(f"Retrieved {len(response.data)} summaries")
-            return response.data
-        return []
+        summaries = response.data or []
+        with _summary_cache_lock:
+            if generation == _summary_cache_generation:
+                _all_summaries_cache = (time.monotonic(), summaries)
+        if summaries:
+            logger.info(f"Retrieved {len(summaries)} summaries")
+        return list(summaries)
     except Exception as e:
         logger.error(f"Failed to get all summaries: {e}")
         return []
+
+
+async def asave_summary(filename: str, summary_text: str) -> None:
+    """Async variant of save_summary; runs the Supabase call in a worker thread."""
+    await asyncio.to_thread(save_summary, filename, summary_text)
+
+
+async def asave_summaries_bulk(summaries: dict[str, str]) -> None:
+    """Async variant of save_summaries_bulk; runs the Supabase call in a worker thread."""
+    await asyncio.to_thread(save_summaries_bulk, summaries)
+
+
+async def aget_summary(filename: str) -> dict | None:
+    """Async variant of get_summary; runs the Supabase call in a worker thread."""
+    return await asyncio.to_thread(get_summary, filename)
+
+
+async def aget_all_summaries() -> list[dict]:
+    """Async variant of get_all_summaries; runs the Supabase call in a worker thread."""
+    return await asyncio.to_thread(get_all_summaries)
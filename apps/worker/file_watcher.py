@@ -1,8 +1,6 @@
 import logging
 import os
 import threading
-import time
-from pathlib import Path
 
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
@@ -12,20 +10,88 @@ from services.vector_db import db_service
 
 logger = logging.getLogger(__name__)
 
+# Quiet period before a burst of file events is delivered as one batch
+DEBOUNCE_SECONDS = 0.5
+# Existing files are handed to the callback in batches of this size on startup
+SCAN_BATCH_SIZE = 50
+
 
 def get_document_set(filepath):
+    # Pure string checks: avoids the stat syscalls of Path.resolve() on every event
     try:
-        monitored_path = Path(config.MONITORED_DIR).resolve()
-        file_path_obj = Path(filepath).resolve()
-        if monitored_path in file_path_obj.parents:
-            rel_path = file_path_obj.relative_to(monitored_path)
-            if len(rel_path.parts) > 1:
-                return rel_path.parts[0]
+        rel_path = os.path.relpath(os.path.abspath(filepath), os.path.abspath(config.MONITORED_DIR))
+        parts = rel_path.split(os.sep)
+        if len(parts) > 1 and parts[0] != os.pardir:
+            return parts[0]
     except Exception:
         pass
     return "all"
 
 
+def build_file_entry(filepath):
+    """
+    Describe a file for the ingest callback.
+    Only the path is handed off; the consumer reads the file itself
+    (e.g. ingestion_service.process_file(filename, filepath=...)).
+    """
+    return {
+        "filename": filepath,
+        "filepath": filepath,
+        "document_set": get_document_set(filepath),
+    }
+
+
+class DebouncedBatcher:
+    """
+    Coalesce file batches and deliver them to callback after a quiet period.
+    Repeated events for the same path within a batch are delivered once.
+    """
+
+    def __init__(self, callback, delay=DEBOUNCE_SECONDS):
+        self.callback = callback
+        self.delay = delay
+        # Map of filepath -> entry; the latest entry wins, first-seen order is kept
+        self._pending = {}
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def __call__(self, files):
+        with self._lock:
+            for entry in files:
+                self._pending[entry.get("filepath") or entry["filename"]] = entry
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = list(self._pending.values()), {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if batch:
+            logger.info(f"Dispatching batch of {len(batch)} new files")
+            try:
+                self.callback(batch)
+            except Exception as e:
+                # Runs on the timer thread, where an uncaught error would go unlogged
+                logger.error(f"Error queueing batch of {len(batch)} files: {e}")
+
+
+class FlushingObserver(Observer):
+    """Observer that delivers the batcher's pending files when it is stopped."""
+
+    def __init__(self, batcher):
+        super().__init__()
+        self.batcher = batcher
+
+    def on_thread_stop(self):
+        super().on_thread_stop()
+        self.batcher.flush()
+
+
 class DocumentHandler(FileSystemEventHandler):
     def __init__(self, callback):
         self.callback = callback
@@ -38,71 +104,84 @@ class DocumentHandler(FileSystemEventHandler):
         if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
             logger.info(f"New file detected: {filepath}")
             try:
-                with open(filepath, "rb") as f:
-                    content = f.read()
-                self.callback(
-                    [
-                        {
-                            "filename": filepath,
-                            "filepath": filepath,
-                            "content": content,
-                            "document_set": get_document_set(filepath),
-                        }
-                    ]
-                )
+                self.callback([build_file_entry(filepath)])
             except Exception as e:
-                logger.error(f"Error reading {filepath}: {e}")
+                logger.error(f"Error queueing {filepath}: {e}")
+
+
+def iter_unindexed_files(path, indexed):
+    """
+    Yield non-empty, non-dot files under path that are not in indexed.
+    Uses os.scandir so file types come from the directory entry without a stat call.
+    """
+    try:
+        entries = list(os.scandir(path))
+    except OSError as e:
+        logger.error(f"Cannot scan {path}: {e}")
+        return
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_unindexed_files(entry.path, indexed)
+            elif (
+                not entry.name.startswith(".")
+                and entry.is_file()
+                and entry.path not in indexed
+                and entry.stat().st_size > 0
+            ):
+                yield entry.path
+        except OSError as e:
+            logger.error(f"Cannot stat {entry.path}: {e}")
 
 
 def get_indexed_filenames():
+    """Return the set of indexed filenames, or None if the index could not be read in full."""
     import asyncio
 
     async def fetch_ids():
-        docs = await db_service.list_documents(limit=10000)
-        return {d.payload.get("filename") for d in docs if d.payload}
+        documents = db_service.iter_documents(columns="id, filename")
+        return {d.payload.get("filename") async for d in documents if d.payload}
 
     try:
         return asyncio.run(fetch_ids())
     except Exception as e:
         logger.warning(f"Could not fetch indexed files: {e}")
-        return set()
+        return None
 
 
 def start_watching(path, callback):
     if not os.path.exists(path):
         os.makedirs(path, exist_ok=True)
 
-    # Simple background scanner (simplified from original)
+    # Background scan for files that were added while the watcher was down
     def scan_existing():
         indexed = get_indexed_filenames()
-        for root, _, files in os.walk(path):
-            for filename in files:
-                if filename.startswith("."):
-                    continue
-                filepath = os.path.join(root, filename)
-                if filepath not in indexed and os.path.getsize(filepath) > 0:
-                    logger.info(f"Processing existing unindexed: {filepath}")
-                    try:
-                        with open(filepath, "rb") as f:
-                            content = f.read()
-                        callback(
-                            [
-                                {
-                                    "filename": filepath,
-                                    "filepath": filepath,
-                                    "content": content,
-                                    "document_set": get_document_set(filepath),
-                                }
-                            ]
-                        )
-                        time.sleep(0.5)
-                    except Exception as e:
-                        logger.error(e)
+        if indexed is None:
+            # A partial view of the index would re-ingest files that are already indexed
+            logger.warning("Skipping scan of existing files")
+            return
+        batch = []
+        for filepath in iter_unindexed_files(path, indexed):
+            logger.info(f"Processing existing unindexed: {filepath}")
+            batch.append(build_file_entry(filepath))
+            if len(batch) >= SCAN_BATCH_SIZE:
+                dispatch(batch)
+                batch = []
+        if batch:
+            dispatch(batch)
+
+    def dispatch(batch):
+        try:
+            callback(batch)
+        except Exception as e:
+            logger.error(e)
 
     threading.Thread(target=scan_existing, daemon=True).start()
 
-    event_handler = DocumentHandler(callback)
-    observer = Observer()
+    batcher = DebouncedBatcher(callback)
+    event_handler = DocumentHandler(batcher)
+    observer = FlushingObserver(batcher)
     observer.schedule(event_handler, path, recursive=True)
     observer.start()
     return observer
@@ -12,12 +12,11 @@ Usage:
     CLIENT_ID=default python main.py
 """
 
-import asyncio
 import logging
 import os
 import sys
 
-from queue_worker import main as run_polling_worker, process_single_task
+from queue_worker import main as run_polling_worker, process_single_task, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +50,7 @@ async def main() -> int:
 
 if __name__ == "__main__":
     try:
-        exit_code = asyncio.run(main())
+        exit_code = run_async(main())
         sys.exit(exit_code)
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
@@ -1,24 +1,38 @@
 import asyncio
-import json
 import logging
 import os
 import signal
 import sys
-from io import BytesIO
 from typing import Any, Dict, Optional, Tuple
 
 import httpx
+import orjson
 
 from services.azure_storage import azure_storage_service
 from services.ingestion import ingestion_service
 from services.queue_service import AzureQueueService
 from summarizer import summarize_document
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
 # Default timeout for single-task mode (30 minutes)
 DEFAULT_TASK_TIMEOUT = int(os.getenv("WORKER_TASK_TIMEOUT", "1800"))
 
+# Maximum number of tasks from one batch processed at the same time
+DEFAULT_BATCH_CONCURRENCY = int(os.getenv("WORKER_BATCH_CONCURRENCY", "4"))
+
+
+def run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
 
 class NotificationService:
     """Service for sending webhook notifications on task completion."""
@@ -26,23 +40,61 @@ class NotificationService:
     def __init__(self):
         self.timeout = 30
         self.api_key = os.environ.get("INTERNAL_API_KEY")
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, so repeated webhooks reuse keep-alive connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
 
     async def send_webhook(self, webhook_url: str, task_data: Dict[str, Any]) -> bool:
         """Send webhook notification to frontend server."""
         try:
-            headers = {}
+            headers = {"Content-Type": "application/json"}
             if self.api_key:
                 headers["X-Internal-Api-Key"] = self.api_key
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(webhook_url, json=task_data, headers=headers)
-                response.raise_for_status()
-                logger.info(f"Webhook sent successfully to {webhook_url}")
-                return True
+            response = await self._get_client().post(
+                webhook_url, content=orjson.dumps(task_data), headers=headers
+            )
+            response.raise_for_status()
+            logger.info(f"Webhook sent successfully to {webhook_url}")
+            return True
         except httpx.HTTPError as e:
             logger.error(f"Webhook failed: {e}")
             return False
 
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+async def download_task_file(file_url: Optional[str], filename: str, document_set: str) -> str:
+    """
+    Stream a task's source blob to a temporary file and return its path.
+
+    The blob is taken from file_url when given, else container/document_set/filename.
+    Files are spooled to disk rather than held in memory, keeping the original
+    extension so Docling can detect the format. The caller removes the file.
+
+    Raises:
+        ValueError: If the download fails
+    """
+    if file_url and isinstance(file_url, str):
+        blob_path = file_url
+    else:
+        blob_path = f"{azure_storage_service.container_name}/{document_set}/{filename}"
+
+    temp_path = await azure_storage_service.download_to_temp_file(
+        blob_path, suffix=os.path.splitext(filename)[1]
+    )
+    if not temp_path:
+        raise ValueError(f"Failed to download file: {filename}")
+    return temp_path
+
 
 class IngestionHandler:
     """Handler for document ingestion tasks."""
@@ -62,18 +114,15 @@ class IngestionHandler:
         logger.info(f"Starting ingestion task: {filename} in {document_set}")
 
         try:
-            if file_url and isinstance(file_url, str):
-                content = await azure_storage_service.download_file_by_path(file_url)
-            else:
-                content = await azure_storage_service.download_file(filename, document_set)
-            if not content:
-                raise ValueError(f"Failed to download file: {filename}")
-
-            result = await self.ingestion_service.process_file(
-                filename,
-                content=content,
-                document_set=document_set,
-            )
+            temp_path = await download_task_file(file_url, filename, document_set)
+            try:
+                result = await self.ingestion_service.process_file(
+                    filename,
+                    filepath=temp_path,
+                    document_set=document_set,
+                )
+            finally:
+                os.remove(temp_path)
 
             logger.info(f"Ingestion completed: {filename}. Result: {result}")
             return {"status": "completed", "result": result}
@@ -92,7 +141,8 @@ class SummarizationHandler:
         """Execute document summarization task."""
         filename = payload.get("filename")
         document_set = payload.get("document_set", "default")
-        file_url = payload.get("file_url")
+        # The API sends the blob reference for summarize tasks as "url"
+        file_url = payload.get("file_url") or payload.get("url")
 
         if not filename or not isinstance(filename, str):
             return {"status": "failed", "error": "Missing required field: filename"}
@@ -100,15 +150,12 @@ class SummarizationHandler:
         logger.info(f"Starting summarization task: {filename} in {document_set}")
 
         try:
-            if file_url and isinstance(file_url, str):
-                content = await azure_storage_service.download_file_by_path(file_url)
-            else:
-                content = await azure_storage_service.download_file(filename, document_set)
-            if not content:
-                raise ValueError(f"Failed to download file: {filename}")
-
-            source = BytesIO(content)
-            summary = summarize_document(source, filename)
+            temp_path = await download_task_file(file_url, filename, document_set)
+            try:
+                # Docling conversion and LLM calls block; keep the event loop free
+                summary = await asyncio.to_thread(summarize_document, temp_path, filename)
+            finally:
+                os.remove(temp_path)
 
             logger.info(f"Summarization completed: {filename}")
             return {"status": "completed", "result": summary}
@@ -155,7 +202,7 @@ def parse_task_data(
     if "|" in task_data_raw and not task_data_raw.strip().startswith("["):
         task_id_prefix, json_content = task_data_raw.split("|", 1)
         try:
-            task_data = json.loads(json_content)
+            task_data = orjson.loads(json_content)
             # Use task_id from JSON if available, else prefix
             task_id = task_data.get("task_id", task_id_prefix)
             task_type = task_data.get("task_type")
@@ -167,13 +214,13 @@ def parse_task_data(
 
             tasks.append((task_id, task_type, payload, webhook_url))
             return tasks
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in task data: {e}")
 
     # Standard JSON format (object or array)
     try:
-        data = json.loads(task_data_raw)
-    except json.JSONDecodeError as e:
+        data = orjson.loads(task_data_raw)
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in task data: {e}")
 
     if isinstance(data, list):
@@ -216,8 +263,11 @@ class SingleTaskRunner:
     Designed for per-task container execution with timeout handling.
     """
 
-    def __init__(self, timeout: int = DEFAULT_TASK_TIMEOUT):
+    def __init__(
+        self, timeout: int = DEFAULT_TASK_TIMEOUT, concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ):
         self.timeout = timeout
+        self.concurrency = max(1, concurrency)
         self.handlers = get_handlers()
         self.notification_service = NotificationService()
 
@@ -245,6 +295,44 @@ class SingleTaskRunner:
             logger.error(f"Task execution failed: {e}")
             return {"status": "failed", "error": str(e)}
 
+    async def _run_task(
+        self,
+        index: int,
+        total: int,
+        task_id: str,
+        task_type: str,
+        payload: Dict[str, Any],
+        webhook_url: Optional[str],
+    ) -> Dict[str, Any]:
+        """Execute one task from a batch and send its webhook notification."""
+        logger.info(f"--- Processing Task {index+1}/{total}: {task_id} ({task_type}) ---")
+
+        # Execute the task
+        result = await self.execute_with_timeout(task_type, payload)
+
+        # Prepare notification
+        notification_data = {
+            "task_id": task_id,
+            "task_type": task_type,
+            "status": result.get("status"),
+            "result": result.get("result"),
+            "error": result.get("error"),
+        }
+
+        # Send webhook notification
+        if webhook_url:
+            success = await self.notification_service.send_webhook(webhook_url, notification_data)
+            if not success:
+                logger.warning(f"Failed to send webhook for task {task_id}")
+
+        # Log completion
+        status = result.get("status")
+        if status == "completed":
+            logger.info(f"Task {task_id} completed successfully")
+        else:
+            logger.error(f"Task {task_id} failed: {result.get('error')}")
+        return result
+
     async def run(self, task_data_raw: str) -> int:
         """
         Run tasks and return exit code.
@@ -272,35 +360,24 @@ class SingleTaskRunner:
 
         logger.info(f"Found {len(tasks)} tasks to process")
 
-        results = []
-        for i, (task_id, task_type, payload, webhook_url) in enumerate(tasks):
-            logger.info(f"--- Processing Task {i+1}/{len(tasks)}: {task_id} ({task_type}) ---")
+        # Tasks in a batch are independent; run up to `concurrency` of them at once
+        semaphore = asyncio.Semaphore(self.concurrency)
 
-            # Execute the task
-            result = await self.execute_with_timeout(task_type, payload)
-            results.append(result)
-
-            # Prepare notification
-            notification_data = {
-                "task_id": task_id,
-                "task_type": task_type,
-                "status": result.get("status"),
-                "result": result.get("result"),
-                "error": result.get("error"),
-            }
+        async def run_bounded(index: int, task: Tuple[str, str, Dict[str, Any], Optional[str]]):
+            async with semaphore:
+                try:
+                    await self._run_task(index, len(tasks), *task)
+                except Exception as e:
+                    # Keep one bad task (e.g. an unserializable result) from cancelling the batch
+                    logger.error(f"Task {task[0]} failed unexpectedly: {e}")
 
-            # Send webhook notification
-            if webhook_url:
-                success = await self.notification_service.send_webhook(webhook_url, notification_data)
-                if not success:
-                    logger.warning(f"Failed to send webhook for task {task_id}")
-
-            # Log completion
-            status = result.get("status")
-            if status == "completed":
-                logger.info(f"Task {task_id} completed successfully")
-            else:
-                logger.error(f"Task {task_id} failed: {result.get('error')}")
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for i, task in enumerate(tasks):
+                    tg.create_task(run_bounded(i, task))
+        finally:
+            # All webhooks are sent; release the pooled connections before exiting
+            await self.notification_service.close()
 
         logger.info("=" * 60)
         logger.info(f"Batch processing complete. Processed {len(tasks)} tasks.")
@@ -333,6 +410,10 @@ class AsyncWorker:
         self.polling_interval = int(os.getenv("WORKER_POLLING_INTERVAL", "5"))
         self.visibility_timeout = int(os.getenv("WORKER_VISIBILITY_TIMEOUT", "30"))
         self.max_messages = int(os.getenv("WORKER_MAX_MESSAGES", "10"))
+        self.task_timeout = DEFAULT_TASK_TIMEOUT
+        # Bounds concurrent tasks per batch, matching SingleTaskRunner
+        self.concurrency = max(1, DEFAULT_BATCH_CONCURRENCY)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
         self.running = False
         self.shutdown_event = asyncio.Event()
 
@@ -351,7 +432,10 @@ class AsyncWorker:
         return self.handlers.get(task_type)
 
     async def process_message(self, message) -> None:
-        """Process a single queue message."""
+        """
+        Process a single queue message.
+        Tasks that exceed task_timeout are cancelled and reported as failed via the webhook.
+        """
         try:
             message_content = message.content
 
@@ -361,7 +445,7 @@ class AsyncWorker:
                 task_id = "unknown"
                 json_content = message_content
 
-            task_data = json.loads(json_content)
+            task_data = orjson.loads(json_content)
             task_type = task_data.get("task_type")
             payload = task_data.get("payload", {})
             webhook_url = task_data.get("webhook_url")
@@ -376,7 +460,13 @@ class AsyncWorker:
                 )
                 return
 
-            result = await handler.execute(payload)
+            try:
+                result = await asyncio.wait_for(handler.execute(payload), timeout=self.task_timeout)
+            except asyncio.TimeoutError:
+                error_msg = f"Task exceeded timeout of {self.task_timeout} seconds"
+                logger.error(f"Task {task_id}: {error_msg}")
+                await self._send_failure_notification(webhook_url, task_id, error_msg)
+                return
 
             notification_data = {
                 "task_id": task_id,
@@ -391,11 +481,25 @@ class AsyncWorker:
 
             logger.info(f"Task {task_id} completed with status: {result.get('status')}")
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in message: {e}")
         except Exception as e:
             logger.error(f"Error processing message: {e}")
 
+    async def _process_and_delete(self, message) -> None:
+        """
+        Process a queue message, then remove it from the queue.
+        At most `concurrency` messages are processed at once.
+        Never raises, so one message cannot cancel the rest of its batch.
+        """
+        async with self._semaphore:
+            await self.process_message(message)
+
+        try:
+            await self.queue_service.delete_message(message)
+        except Exception as e:
+            logger.error(f"Failed to complete message {message.id}: {e}")
+
     async def _send_failure_notification(self, webhook_url: str, task_id: str, error: str) -> None:
         """Send failure notification."""
         if webhook_url:
@@ -406,6 +510,13 @@ class AsyncWorker:
             }
             await self.notification_service.send_webhook(webhook_url, notification_data)
 
+    async def _idle(self) -> None:
+        """Wait out the polling interval, returning early if shutdown is requested."""
+        try:
+            await asyncio.wait_for(self.shutdown_event.wait(), timeout=self.polling_interval)
+        except asyncio.TimeoutError:
+            pass
+
     async def run(self) -> None:
         """Main worker loop."""
         logger.info(f"Worker starting for queue: {self.queue_name}")
@@ -422,20 +533,24 @@ class AsyncWorker:
                     if messages:
                         logger.info(f"Received {len(messages)} messages")
 
-                        for message in messages:
-                            await self.process_message(message)
-                            await self.queue_service.delete_message(message)
+                        # Process the batch concurrently (bounded by the semaphore) so one
+                        # slow task doesn't hold up the rest
+                        async with asyncio.TaskGroup() as tg:
+                            for message in messages:
+                                tg.create_task(self._process_and_delete(message))
                     else:
-                        await asyncio.sleep(self.polling_interval)
+                        await self._idle()
 
                 except Exception as e:
                     logger.error(f"Error in worker loop: {e}")
-                    await asyncio.sleep(self.polling_interval)
+                    await self._idle()
 
         except asyncio.CancelledError:
             logger.info("Worker cancelled, shutting down...")
         finally:
             self.running = False
+            # The loop and its TaskGroup are done, so no task can still send a webhook
+            await self.notification_service.close()
             logger.info("Worker stopped")
 
     async def shutdown(self) -> None:
@@ -485,6 +600,6 @@ async def main() -> None:
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_async(main())
     except KeyboardInterrupt:
         sys.exit(0)
@@ -1,4 +1,5 @@
 import logging
+from typing import AsyncIterator
 
 import nest_asyncio
 from pydantic_ai import Agent
@@ -12,13 +13,21 @@ logger = logging.getLogger(__name__)
 # Apply nest_asyncio
 nest_asyncio.apply()
 
+CHAT_SYSTEM_PROMPT = "You are a helpful assistant."
+RAG_SYSTEM_PROMPT = (
+    "You are a helpful assistant. Answer the user's question based ONLY on the following context. "
+    "If the answer is not in the context, say so.\n\n"
+)
+QA_SYSTEM_PROMPT = "You are an assistant answering questions based oNLY on the provided context."
+QA_PROMPT = "Context:\n{context}\n\nQuestion: {question}"
+
 
 def run_sync_agent(user_input: str) -> str:
     """Simple chat agent."""
     if not config.OPENAI_API_KEY:
         return "Error: OPENAI_API_KEY not found."
 
-    agent = Agent(get_model(), system_prompt="You are a helpful assistant.")
+    agent = Agent(get_model(), system_prompt=CHAT_SYSTEM_PROMPT)
 
     try:
         result = agent.run_sync(user_input)
@@ -27,12 +36,26 @@ def run_sync_agent(user_input: str) -> str:
         return f"Error running agent: {str(e)}"
 
 
-def perform_rag(query: str, limit: int = 10, document_set: str = None) -> dict:
+async def run_async_agent(user_input: str) -> str:
+    """Simple chat agent; awaits the model instead of blocking the event loop."""
+    if not config.OPENAI_API_KEY:
+        return "Error: OPENAI_API_KEY not found."
+
+    agent = Agent(get_model(), system_prompt=CHAT_SYSTEM_PROMPT)
+
+    try:
+        result = await agent.run(user_input)
+        return result.output
+    except Exception as e:
+        return f"Error running agent: {str(e)}"
+
+
+async def perform_rag(query: str, limit: int = 10, document_set: str = None) -> dict:
     """RAG Workflow."""
     if not config.OPENAI_API_KEY:
         return {"answer": "Error: Missing API Key", "results": []}
 
-    results = db_service.search(query, limit, document_set)
+    results = await db_service.search(query, limit, document_set)
 
     if not results:
         return {
@@ -44,18 +67,12 @@ def perform_rag(query: str, limit: int = 10, document_set: str = None) -> dict:
         [f"Source '{r['metadata']['filename']}':\n{r['content']}" for r in results]
     )
 
-    agent = Agent(
-        get_model(),
-        system_prompt=(
-            "You are a helpful assistant. Answer the user's question based ONLY on the following context. "
-            "If the answer is not in the context, say so.\n\n"
-        ),
-    )
+    agent = Agent(get_model(), system_prompt=RAG_SYSTEM_PROMPT)
 
-    full_prompt = f"Context:\n{context_str}\n\nQuestion: {query}"
+    full_prompt = QA_PROMPT.format(context=context_str, question=query)
 
     try:
-        result = agent.run_sync(full_prompt)
+        result = await agent.run(full_prompt)
         answer = result.output
     except Exception as e:
         answer = f"Error generating answer: {str(e)}"
@@ -63,12 +80,20 @@ def perform_rag(query: str, limit: int = 10, document_set: str = None) -> dict:
     return {"answer": answer, "results": results}
 
 
-def run_qa_agent(context: str, question: str) -> str:
+def _qa_agent() -> Agent:
+    return Agent(get_model(), system_prompt=QA_SYSTEM_PROMPT)
+
+
+async def run_qa_agent(context: str, question: str) -> str:
     """Runs QA on provided context."""
-    agent = Agent(
-        get_model(),
-        system_prompt="You are an assistant answering questions based oNLY on the provided context.",
-    )
-    user_prompt = f"Context:\n{context}\n\nQuestion: {question}"
-    result = agent.run_sync(user_prompt)
+    user_prompt = QA_PROMPT.format(context=context, question=question)
+    result = await _qa_agent().run(user_prompt)
     return result.output
+
+
+async def stream_qa_agent(context: str, question: str) -> AsyncIterator[str]:
+    """Runs QA on provided context, yielding answer text as it is generated."""
+    user_prompt = QA_PROMPT.format(context=context, question=question)
+    async with _qa_agent().run_stream(user_prompt) as result:
+        async for delta in result.stream_text(delta=True):
+            yield delta
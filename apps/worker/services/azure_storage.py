@@ -1,4 +1,9 @@
+import asyncio
 import logging
+import os
+import tempfile
+from typing import BinaryIO
+
 from azure.storage.blob import BlobServiceClient
 import config
 
@@ -25,7 +30,7 @@ class AzureStorageService:
         try:
             blob_path = f"{document_set}/{filename}"
             blob_client = self.container_client.get_blob_client(blob_path)
-            blob_client.upload_blob(content, overwrite=True)
+            await asyncio.to_thread(blob_client.upload_blob, content, overwrite=True)
             logger.info(f"Uploaded: {blob_path} ({len(content)} bytes)")
             return True
         except Exception as e:
@@ -37,8 +42,8 @@ class AzureStorageService:
         try:
             blob_path = f"{document_set}/{filename}"
             blob_client = self.container_client.get_blob_client(blob_path)
-            blob = blob_client.download_blob()
-            content = blob.readall()
+            blob = await asyncio.to_thread(blob_client.download_blob)
+            content = await asyncio.to_thread(blob.readall)
             logger.info(f"Downloaded: {blob_path} ({len(content)} bytes)")
             return content
         except Exception as e:
@@ -56,20 +61,72 @@ class AzureStorageService:
 
             container_client = self.blob_service_client.get_container_client(container_name)
             blob_client = container_client.get_blob_client(blob_name)
-            blob = blob_client.download_blob()
-            content = blob.readall()
+            blob = await asyncio.to_thread(blob_client.download_blob)
+            content = await asyncio.to_thread(blob.readall)
             logger.info(f"Downloaded by path: {blob_path} ({len(content)} bytes)")
             return content
         except Exception as e:
             logger.error(f"Azure download by path failed for {blob_path}: {e}")
             return None
 
+    async def download_to_stream(self, blob_path: str, stream: BinaryIO) -> int | None:
+        """Stream file by full path (e.g., 'demo/vegetables/kale.md') into a writable stream.
+
+        Chunks are written straight into the caller's buffer instead of being
+        materialized as an intermediate bytes object.
+
+        Returns:
+            Number of bytes written, or None on failure
+        """
+        try:
+            parts = blob_path.split("/", 1)
+            if len(parts) != 2:
+                raise ValueError(f"Invalid blob path format: {blob_path}")
+
+            container_name, blob_name = parts
+
+            container_client = self.blob_service_client.get_container_client(container_name)
+            blob_client = container_client.get_blob_client(blob_name)
+            blob = await asyncio.to_thread(blob_client.download_blob)
+            size = await asyncio.to_thread(blob.readinto, stream)
+            logger.info(f"Streamed: {blob_path} ({size} bytes)")
+            return size
+        except Exception as e:
+            logger.error(f"Azure streamed download failed for {blob_path}: {e}")
+            return None
+
+    async def download_to_temp_file(self, blob_path: str, suffix: str = "") -> str | None:
+        """Stream file by full path into a named temporary file on disk.
+
+        Memory use stays flat regardless of blob size. The caller is responsible
+        for removing the file.
+
+        Args:
+            blob_path: Full path including container (e.g., 'demo/vegetables/kale.md')
+            suffix: Extension for the temp file, so format detection still works
+
+        Returns:
+            Path of the temporary file, or None on failure
+        """
+        temp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+        try:
+            with temp:
+                size = await self.download_to_stream(blob_path, temp)
+        except BaseException:
+            # Includes cancellation by a task timeout; don't leave the partial file behind
+            os.remove(temp.name)
+            raise
+        if size is None:
+            os.remove(temp.name)
+            return None
+        return temp.name
+
     async def delete_file(self, filename: str, document_set: str) -> bool:
         """Delete file from container/{document_set}/{filename}"""
         try:
             blob_path = f"{document_set}/{filename}"
             blob_client = self.container_client.get_blob_client(blob_path)
-            blob_client.delete_blob()
+            await asyncio.to_thread(blob_client.delete_blob)
             logger.info(f"Deleted: {blob_path}")
             return True
         except Exception as e:
@@ -81,7 +138,7 @@ class AzureStorageService:
         try:
             blob_path = f"{document_set}/{filename}"
             blob_client = self.container_client.get_blob_client(blob_path)
-            return blob_client.exists()
+            return await asyncio.to_thread(blob_client.exists)
         except Exception as e:
             logger.error(f"Azure existence check failed for {filename}: {e}")
             return False
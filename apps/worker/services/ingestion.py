@@ -1,3 +1,4 @@
+import asyncio
 import gc
 import logging
 import uuid
@@ -15,8 +16,10 @@ logger = logging.getLogger(__name__)
 
 
 class IngestionService:
-    def __init__(self):
+    def __init__(self, batch_size: int = 64):
         self.splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+        # Chunks per embedding request and per upsert
+        self.batch_size = batch_size
         self._standard_pipeline = None
         self._vlm_pipeline = None
 
@@ -31,6 +34,35 @@ class IngestionService:
                 self._standard_pipeline = PipelineFactory.create_pipeline(use_vlm=False)
             return self._standard_pipeline
 
+    def _convert_to_markdown(self, pipeline, input_source, filename, content):
+        """Convert a file to markdown, or return None if the source can't be prepared."""
+        source, temp_file_to_cleanup = FileConversionUtils.prepare_source_for_conversion(
+            input_source, filename
+        )
+        try:
+            if not source:
+                return None
+
+            if content and not FileConversionUtils.is_xls_file(None, filename):
+                source = DocumentStream(name=filename, stream=BytesIO(content))
+
+            doc_result = pipeline.get_converter().convert(source)
+            markdown_content = doc_result.document.export_to_markdown()
+            pipeline.cleanup_backend(doc_result)
+            return markdown_content
+        finally:
+            FileConversionUtils.cleanup_temp_file(temp_file_to_cleanup)
+
+    async def _discard_partial_index(self, filename, point_ids):
+        """Remove the chunks this run already upserted for a file whose later batch failed."""
+        if not point_ids:
+            return
+        logger.warning(f"Removing {len(point_ids)} partially indexed chunks of {filename}")
+        try:
+            await db_service.delete_points(point_ids)
+        except Exception as e:
+            logger.error(f"Failed to remove partial index for {filename}: {e}")
+
     async def _process_content_flow(
         self, filename, content=None, filepath=None, document_set="all", use_vlm=False
     ):
@@ -39,63 +71,50 @@ class IngestionService:
         pipeline_type = pipeline.get_pipeline_name()
         logger.info(f"Processing file: {filename} (Pipeline: {pipeline_type})")
 
-        temp_file_to_cleanup = None
-        markdown_content = ""
+        input_source = filepath or (BytesIO(content) if content else None)
+        if input_source is None:
+            return "No content or filepath provided."
 
+        # 1. Conversion: file I/O and Docling block, so keep them off the event loop
         try:
-            input_source = filepath or (BytesIO(content) if content else None)
-
-            if input_source is None:
-                return "No content or filepath provided."
-
-            source, temp_file_to_cleanup = FileConversionUtils.prepare_source_for_conversion(
-                input_source, filename
+            markdown_content = await asyncio.to_thread(
+                self._convert_to_markdown, pipeline, input_source, filename, content
             )
-
-            if not source:
-                return f"Failed to prepare source for {filename}"
-
-            elif content and not FileConversionUtils.is_xls_file(None, filename):
-                source = DocumentStream(name=filename, stream=BytesIO(content))
-
-            converter = pipeline.get_converter()
-            doc_result = converter.convert(source)
-            markdown_content = doc_result.document.export_to_markdown()
-
-            pipeline.cleanup_backend(doc_result)
-            FileConversionUtils.cleanup_temp_file(temp_file_to_cleanup)
-
         except Exception as e:
-            FileConversionUtils.cleanup_temp_file(temp_file_to_cleanup)
             return f"Conversion failed for {filename}: {e}"
 
+        if markdown_content is None:
+            return f"Failed to prepare source for {filename}"
+
         # 2. Chunking
-        chunks = self.splitter.split_text(markdown_content)
+        chunks = await asyncio.to_thread(self.splitter.split_text, markdown_content)
         chunks = [str(c) for c in chunks if c and str(c).strip()]
 
         if not chunks:
             return f"Skipped {filename}: No content extracted."
 
-        # 3. Embedding
-        vectors = []
+        # 3. Embedding + 4. Upsert (Indexing), one batch at a time so each embedding
+        # request stays bounded and only one batch of vectors is held in memory
         embeddings_model = LLMService.get_embeddings()
+        # Ids written by this run, so a failure only rolls back its own chunks
+        upserted_ids = []
 
-        try:
-            # Prefer async embedding if available
-            if hasattr(embeddings_model, "aembed_documents"):
-                vectors = await embeddings_model.aembed_documents(chunks)
-            else:
-                vectors = embeddings_model.embed_documents(chunks)
-        except Exception as e:
-            return f"Embedding failed for {filename}: {e}"
+        for i in range(0, len(chunks), self.batch_size):
+            batch = chunks[i : i + self.batch_size]
+            try:
+                # Prefer async embedding if available
+                if hasattr(embeddings_model, "aembed_documents"):
+                    vectors = await embeddings_model.aembed_documents(batch)
+                else:
+                    vectors = await asyncio.to_thread(embeddings_model.embed_documents, batch)
+            except Exception as e:
+                await self._discard_partial_index(filename, upserted_ids)
+                return f"Embedding failed for {filename}: {e}"
 
-        # 4. Upsert (Indexing)
-        points = []
-        for i, chunk in enumerate(chunks):
-            points.append(
+            points = [
                 {
                     "id": str(uuid.uuid4()),
-                    "vector": vectors[i],
+                    "vector": vector,
                     "payload": {
                         "filename": filename,
                         "content": chunk,
@@ -103,15 +122,15 @@ class IngestionService:
                         "pipeline": pipeline_type,
                     },
                 }
-            )
+                for chunk, vector in zip(batch, vectors)
+            ]
 
-        batch_size = 64
-        for i in range(0, len(points), batch_size):
             try:
-                batch_points = points[i : i + batch_size]
-                await db_service.upsert_vectors(batch_points)  # await async method
+                await db_service.upsert_vectors(points)  # await async method
             except Exception as e:
+                await self._discard_partial_index(filename, upserted_ids)
                 return f"Upsert failed for batch {i}: {e}"
+            upserted_ids.extend(point["id"] for point in points)
 
         # Explicit GC still helpful for heavyweight VLM artifacts
         gc.collect()
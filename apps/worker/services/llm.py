@@ -1,4 +1,8 @@
+import asyncio
 import logging
+import threading
+import weakref
+from collections import OrderedDict
 
 from openai import OpenAI
 from pydantic_ai.models.openai import OpenAIChatModel
@@ -8,6 +12,9 @@ import config
 
 logger = logging.getLogger(__name__)
 
+# Recent query embeddings kept per process; repeated prompts skip the API round-trip
+QUERY_EMBEDDING_CACHE_SIZE = 4096
+
 
 class OpenAIEmbeddings:
     def __init__(self, model_name, api_key=None, api_base=None):
@@ -29,6 +36,8 @@ class OpenAIEmbeddings:
                 "X-Title": "Python Agents Worker"
             }
         )
+        self._query_cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._query_cache_lock = threading.Lock()
 
     def embed_documents(self, texts):
         response = self.client.embeddings.create(
@@ -38,25 +47,64 @@ class OpenAIEmbeddings:
         return [r.embedding for r in response.data]
 
     def embed_query(self, text):
+        """Embed a single query, reusing the vector for recently seen identical text."""
+        with self._query_cache_lock:
+            cached = self._query_cache.get(text)
+            if cached is not None:
+                self._query_cache.move_to_end(text)
+                return list(cached)
+
         response = self.client.embeddings.create(
             model=self.model,
             input=[text],
         )
-        return response.data[0].embedding
+        embedding = response.data[0].embedding
+
+        with self._query_cache_lock:
+            self._query_cache[text] = embedding
+            self._query_cache.move_to_end(text)
+            if len(self._query_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return list(embedding)
 
 
 class LLMService:
     _instance = None
+    # The provider's async HTTP client is bound to the event loop it first runs on, so
+    # chat models are cached per running loop, and per thread for sync callers
+    # (agent.run_sync drives the calling thread's own loop).
+    _loop_models: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, OpenAIChatModel]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _thread_models = threading.local()
     _embedding_model = None
 
-    @classmethod
-    def get_model(cls):
-        """Returns the configured PydanticAI OpenAIChatModel."""
+    @staticmethod
+    def _create_model():
         return OpenAIChatModel(
             config.OPENAI_MODEL,
             provider=OpenAIProvider(base_url=config.OPENAI_API_BASE, api_key=config.OPENAI_API_KEY),
         )
 
+    @classmethod
+    def get_model(cls):
+        """Returns the configured PydanticAI OpenAIChatModel for the current event loop or thread."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            model = getattr(cls._thread_models, "model", None)
+            if model is None:
+                model = cls._thread_models.model = cls._create_model()
+            return model
+
+        model = cls._loop_models.get(loop)
+        if model is None:
+            model = cls._loop_models[loop] = cls._create_model()
+        return model
+
     @classmethod
     def get_embeddings(cls):
         """Returns the OpenAIEmbeddings model (Singleton)."""
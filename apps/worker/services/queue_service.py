@@ -6,13 +6,13 @@ to replace Celery in serverless deployments.
 """
 
 import asyncio
-import json
 import logging
 import os
 from functools import wraps
 from typing import Any, Dict, Optional
 
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -147,6 +147,7 @@ class AzureQueueService(QueueService):
         self.client_id = os.getenv("CLIENT_ID", "default").lower()
         self.queue_name = f"{self.client_id}-tasks"
         self._queue_ensured = False
+        self._queue_client = None
 
         if not self.connection_string:
             logger.warning("AZURE_STORAGE_CONNECTION_STRING not configured")
@@ -158,19 +159,27 @@ class AzureQueueService(QueueService):
             f"AzureQueueService initialized for client '{self.client_id}' with queue '{self.queue_name}'"
         )
 
+    def _get_queue_client(self):
+        """Return the shared queue client, creating it on first use.
+
+        Reusing one client keeps its HTTP connection pool alive across polls.
+        """
+        if self._queue_client is None:
+            from azure.storage.queue import QueueServiceClient
+
+            queue_service = QueueServiceClient.from_connection_string(self.connection_string)
+            self._queue_client = queue_service.get_queue_client(self.queue_name)
+        return self._queue_client
+
     def _ensure_queue_exists(self) -> None:
         """Create the queue if it doesn't exist."""
         if self._queue_ensured or not self.connection_string:
             return
 
         try:
-            from azure.storage.queue import QueueServiceClient
             from azure.core.exceptions import ResourceExistsError
 
-            queue_service = QueueServiceClient.from_connection_string(
-                self.connection_string
-            )
-            queue_client = queue_service.get_queue_client(self.queue_name)
+            queue_client = self._get_queue_client()
 
             try:
                 queue_client.create_queue()
@@ -199,18 +208,14 @@ class AzureQueueService(QueueService):
             raise RuntimeError("Azure Queue not configured")
 
         import uuid
-        import json
-
-        from azure.storage.queue import QueueServiceClient
 
-        queue_client = QueueServiceClient.from_connection_string(self.connection_string)
-        queue_client = queue_client.get_queue_client(self.queue_name)
+        queue_client = self._get_queue_client()
 
         task_id = str(uuid.uuid4())
-        message = json.dumps({"task_type": task_type, "payload": payload})
+        message = orjson.dumps({"task_type": task_type, "payload": payload}).decode()
 
         self._validate_message_size(message)
-        queue_client.send_message(task_id + "|" + message)
+        await asyncio.to_thread(queue_client.send_message, task_id + "|" + message)
         logger.info(f"Submitted task {task_type} with ID {task_id}")
         return task_id
 
@@ -222,15 +227,15 @@ class AzureQueueService(QueueService):
         if not self.connection_string:
             raise RuntimeError("Azure Queue not configured")
 
-        from azure.storage.queue import QueueServiceClient
+        queue_client = self._get_queue_client()
 
-        queue_client = QueueServiceClient.from_connection_string(self.connection_string)
-        queue_client = queue_client.get_queue_client(self.queue_name)
+        def receive() -> list:
+            messages = queue_client.receive_messages(
+                messages_per_page=max_messages, visibility_timeout=visibility_timeout
+            )
+            return list(messages)
 
-        messages = queue_client.receive_messages(
-            messages_per_page=max_messages, visibility_timeout=visibility_timeout
-        )
-        return list(messages)
+        return await asyncio.to_thread(receive)
 
     @retry_with_backoff(max_retries=3, base_delay=1.0, max_delay=10.0)
     async def delete_message(self, message) -> None:
@@ -238,12 +243,9 @@ class AzureQueueService(QueueService):
         if not self.connection_string:
             raise RuntimeError("Azure Queue not configured")
 
-        from azure.storage.queue import QueueServiceClient
-
-        queue_client = QueueServiceClient.from_connection_string(self.connection_string)
-        queue_client = queue_client.get_queue_client(self.queue_name)
+        queue_client = self._get_queue_client()
 
-        queue_client.delete_message(message)
+        await asyncio.to_thread(queue_client.delete_message, message)
 
     async def get_task_status(self, task_id: str) -> Dict[str, Any]:
         # Azure Queue doesn't have built-in task status tracking
@@ -0,0 +1,89 @@
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Cosine similarity at which two queries are treated as the same question
+SIMILARITY_THRESHOLD = 0.95
+# Seconds a cached result stays valid
+CACHE_TTL = 300.0
+# Maximum cached queries per scope
+MAX_ENTRIES = 256
+
+
+class SemanticCache:
+    """
+    In-memory cache of search results keyed by query embedding similarity.
+
+    Entries are grouped by scope (e.g. document set and limit) so results never
+    cross between scopes. Within a scope the most similar cached query is used if
+    its cosine similarity reaches the threshold.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl: float = CACHE_TTL,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Map of scope -> OrderedDict[entry_id, (expires_at, unit_vector, value)], LRU order
+        self._scopes: dict[Hashable, OrderedDict[int, tuple[float, np.ndarray, Any]]] = {}
+        self._next_id = 0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray | None:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        if not norm:
+            return None
+        return array / norm
+
+    def _prune(self, entries: OrderedDict[int, tuple[float, np.ndarray, Any]]) -> None:
+        now = time.monotonic()
+        for entry_id in [k for k, (expires_at, _, _) in entries.items() if expires_at <= now]:
+            del entries[entry_id]
+
+    def get(self, vector: Sequence[float], scope: Hashable = None) -> Any | None:
+        """Return the cached value for the most similar query in scope, if close enough."""
+        entries = self._scopes.get(scope)
+        if not entries:
+            return None
+
+        self._prune(entries)
+        query = self._normalize(vector)
+        if query is None or not entries:
+            return None
+
+        ids = list(entries)
+        scores = np.stack([entries[i][1] for i in ids]) @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        entries.move_to_end(ids[best])
+        logger.debug(f"Semantic cache hit (similarity={scores[best]:.3f})")
+        return entries[ids[best]][2]
+
+    def put(self, vector: Sequence[float], value: Any, scope: Hashable = None) -> None:
+        """Cache a value for a query embedding within a scope."""
+        unit = self._normalize(vector)
+        if unit is None:
+            return
+
+        entries = self._scopes.setdefault(scope, OrderedDict())
+        entries[self._next_id] = (time.monotonic() + self.ttl, unit, value)
+        self._next_id += 1
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries, e.g. after the underlying data changed."""
+        self._scopes.clear()
@@ -1,59 +1,101 @@
 import asyncio
-from collections import defaultdict
-from typing import Dict, Set
+from collections import defaultdict, deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Set, Tuple
 import logging
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Number of recent messages retained for connections that fall behind
+RING_SIZE = 1024
+
+
+def encode_sse_frame(message: dict) -> bytes:
+    """Encode a message as a complete SSE frame, using its "type" as the event name."""
+    frame = b"data: " + orjson.dumps(message) + b"\n\n"
+    event_type = message.get("type")
+    if event_type:
+        frame = b"event: " + str(event_type).encode() + b"\n" + frame
+    return frame
+
 
 class SSEConnectionManager:
-    """Manages SSE connections with in-memory message queuing."""
+    """Manages SSE connections with a shared in-memory message ring."""
 
-    def __init__(self):
-        # Map of connection_id -> asyncio.Queue
-        self.connections: Dict[str, asyncio.Queue] = {}
+    def __init__(self, ring_size: int = RING_SIZE):
+        # Shared ring of (seq, user_id, frame); user_id None targets all connections
+        self._ring: Deque[Tuple[int, Optional[str], bytes]] = deque(maxlen=ring_size)
+        self._seq = 0
+        # Single event wakes every listener once per broadcast
+        self._event = asyncio.Event()
+        # Map of connection_id -> next sequence number to read
+        self.connections: Dict[str, int] = {}
         # Map of user_id -> Set[connection_id] for multi-tab support
         self.user_connections: Dict[str, Set[str]] = defaultdict(set)
 
-    async def connect(self, connection_id: str, user_id: str) -> asyncio.Queue:
-        """Register new SSE connection and return its message queue."""
-        queue = asyncio.Queue(maxsize=100)  # Prevent memory bloat
-        self.connections[connection_id] = queue
+    async def connect(self, connection_id: str, user_id: str) -> None:
+        """Register new SSE connection; it receives messages broadcast from now on."""
+        self.connections[connection_id] = self._seq
         self.user_connections[user_id].add(connection_id)
         logger.info(f"SSE client {connection_id} connected. Total: {len(self.connections)}")
-        return queue
 
     def disconnect(self, connection_id: str, user_id: str):
         """Remove connection and cleanup."""
         self.connections.pop(connection_id, None)
         self.user_connections[user_id].discard(connection_id)
+        if not self.user_connections[user_id]:
+            del self.user_connections[user_id]
         logger.info(f"SSE client {connection_id} disconnected. Total: {len(self.connections)}")
 
     async def broadcast(self, message: dict, user_id: str = None):
         """
         Broadcast message to connections.
-        If user_id specified, only send to that user's connections.
+        If user_id specified, only that user's connections will receive it.
         Otherwise broadcast to all.
+        The message is encoded once and every connection shares the same frame.
+        """
+        self._ring.append((self._seq, user_id, encode_sse_frame(message)))
+        self._seq += 1
+        # Wake current waiters, then re-arm for the next broadcast
+        self._event.set()
+        self._event.clear()
+
+    def _drain(self, connection_id: str, user_id: str) -> List[bytes]:
+        """Collect all frames for a connection since its last read."""
+        next_seq = self.connections[connection_id]
+        if next_seq == self._seq:
+            return []
+
+        if self._ring and next_seq < self._ring[0][0]:
+            logger.warning(
+                f"SSE client {connection_id} fell behind, "
+                f"dropping {self._ring[0][0] - next_seq} messages"
+            )
+
+        # Sequence numbers in the ring are contiguous, so the unread entries are the
+        # newest (self._seq - next_seq); walk them from the tail instead of scanning the ring
+        unread = list(islice(reversed(self._ring), self._seq - next_seq))
+        frames = [
+            frame for _, target, frame in reversed(unread) if target is None or target == user_id
+        ]
+        self.connections[connection_id] = self._seq
+        return frames
+
+    async def listen(self, connection_id: str, user_id: str) -> List[bytes]:
+        """
+        Wait until new messages are available for a connection and return their
+        pre-encoded SSE frames as one batch.
+
+        Raises:
+            KeyError: If the connection is not registered
         """
-        target_connections = (
-            self.user_connections.get(user_id, set()) if user_id else set(self.connections.keys())
-        )
-
-        dead_connections = []
-        for conn_id in target_connections:
-            queue = self.connections.get(conn_id)
-            if queue:
-                try:
-                    queue.put_nowait(message)
-                except asyncio.QueueFull:
-                    logger.warning(f"Queue full for {conn_id}, dropping message")
-            else:
-                dead_connections.append(conn_id)
-
-        # Cleanup dead connections
-        for conn_id in dead_connections:
-            if user_id:
-                self.disconnect(conn_id, user_id)
+        while True:
+            frames = self._drain(connection_id, user_id)
+            if frames:
+                return frames
+            await self._event.wait()
 
 
 sse_manager = SSEConnectionManager()
@@ -2,6 +2,7 @@ import logging
 import threading
 from typing import Any, Optional
 
+from postgrest import ReturnMethod
 from supabase import Client, create_client
 
 import config
@@ -79,13 +80,20 @@ class SupabaseService:
             logger.error(f"RPC {function_name} failed: {e}")
             raise
 
-    def upsert(self, table: str, data: list[dict[str, Any]]) -> Any:
+    def upsert(
+        self,
+        table: str,
+        data: list[dict[str, Any]],
+        returning: ReturnMethod = ReturnMethod.minimal,
+    ) -> Any:
         """
         Upsert records into a table.
 
         Args:
             table: Table name
             data: List of records to upsert
+            returning: PostgREST return method; "minimal" skips echoing the
+                written rows (including embeddings) back over the wire
 
         Returns:
             Response from the upsert operation
@@ -96,18 +104,25 @@ class SupabaseService:
         """
         try:
             client = self._ensure_client()
-            return client.table(table).upsert(data).execute()
+            return client.table(table).upsert(data, returning=returning).execute()
         except Exception as e:
             logger.error(f"Upsert to {table} failed: {e}")
             raise
 
-    def delete(self, table: str, filters: dict[str, Any]) -> Any:
+    def delete(
+        self,
+        table: str,
+        filters: dict[str, Any],
+        returning: ReturnMethod = ReturnMethod.minimal,
+    ) -> Any:
         """
         Delete records from a table based on simple equality filters.
 
         Args:
             table: Table name
-            filters: Dictionary of column_name -> value for filtering
+            filters: Dictionary of column_name -> value for filtering; list values
+                match any of their items (IN)
+            returning: PostgREST return method; "minimal" skips returning deleted rows
 
         Returns:
             Response from the delete operation
@@ -118,16 +133,21 @@ class SupabaseService:
         """
         try:
             client = self._ensure_client()
-            query = client.table(table).delete()
+            query = client.table(table).delete(returning=returning)
             for col, val in filters.items():
-                query = query.eq(col, val)
+                query = query.in_(col, val) if isinstance(val, list) else query.eq(col, val)
             return query.execute()
         except Exception as e:
             logger.error(f"Delete from {table} failed: {e}")
             raise
 
     def select(
-        self, table: str, columns: str = "*", range_start: int = None, range_end: int = None
+        self,
+        table: str,
+        columns: str = "*",
+        range_start: int = None,
+        range_end: int = None,
+        order: str = None,
     ) -> Any:
         """
         Select records from a table.
@@ -137,6 +157,7 @@ class SupabaseService:
             columns: Columns to select (default: "*")
             range_start: Starting index for pagination
             range_end: Ending index for pagination
+            order: Column to sort by (ascending); required for stable pagination
 
         Returns:
             Response from the select operation
@@ -148,6 +169,8 @@ class SupabaseService:
         try:
             client = self._ensure_client()
             query = client.table(table).select(columns)
+            if order:
+                query = query.order(order)
             if range_start is not None and range_end is not None:
                 query = query.range(range_start, range_end)
             return query.execute()
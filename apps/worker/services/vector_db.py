@@ -1,10 +1,16 @@
+import asyncio
+import copy
 import logging
 import re
+import time
 import uuid
+from collections import deque
+from collections.abc import AsyncIterator
 from typing import Any
 
 import config
 from services.llm import get_embeddings_model
+from services.semantic_cache import SemanticCache
 from services.supabase_service import supabase_service
 from services.vector_db_interfaces import (
     DocumentMetadataReader,
@@ -15,6 +21,18 @@ from services.vector_db_interfaces import (
 
 logger = logging.getLogger(__name__)
 
+# Payload keys stored as dedicated columns rather than inside metadata
+_COLUMN_PAYLOAD_KEYS = frozenset({"filename", "content", "document_set"})
+
+# Columns fetched by list_documents unless the caller asks for fewer
+DOCUMENT_COLUMNS = "id, content, filename, document_set, metadata"
+
+# Seconds that distinct filename/document_set listings are served from memory
+LISTING_CACHE_TTL = 3.0
+
+# Ids per delete_points request; keeps the PostgREST "in" filter within URL limits
+DELETE_BATCH_SIZE = 100
+
 
 class DocumentPoint:
     """Compatibility wrapper for document results (mimics Qdrant point)."""
@@ -31,34 +49,63 @@ class VectorDBService(
         self.supabase = supabase_service
         self.table_name = config.VECTOR_TABLE_NAME or "documents"
         self._validate_table_name()
+        # Map of listing name -> (fetched_at, result); cleared on every write
+        self._listing_cache: dict[str, tuple[float, list]] = {}
+        # Recent search results, reused for near-identical queries; cleared on every write
+        self._search_cache = SemanticCache()
 
     def _validate_table_name(self):
         """Ensure table name is safe."""
         if not re.match(r"^[a-zA-Z0-9_]+$", self.table_name):
             raise ValueError(f"Invalid table name: {self.table_name}")
 
+    def _get_cached_listing(self, key: str) -> list | None:
+        entry = self._listing_cache.get(key)
+        if entry and time.monotonic() - entry[0] < LISTING_CACHE_TTL:
+            return list(entry[1])
+        return None
+
+    def _set_cached_listing(self, key: str, value: list) -> None:
+        self._listing_cache[key] = (time.monotonic(), value)
+
     async def search(
-        self, query: str, limit: int = 10, document_set: str = None
+        self, query: str, limit: int = 10, document_set: str = None, ef_search: int = None
     ) -> list[dict[str, Any]]:
+        """
+        Similarity search over stored chunks.
+
+        ef_search overrides config.VECTOR_EF_SEARCH for this query: lower values
+        favour latency for interactive lookups, higher values favour recall.
+        Results for semantically equivalent recent queries are served from memory.
+        """
         if not self.supabase.is_available():
             return []
 
         embeddings = get_embeddings_model()
         try:
-            query_vector = embeddings.embed_query(query)
+            query_vector = await asyncio.to_thread(embeddings.embed_query, query)
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             return []
 
+        filter_document_set = document_set if document_set != "all" else None
+        ef_search = ef_search or config.VECTOR_EF_SEARCH
+        cache_scope = (filter_document_set, limit, ef_search)
+        cached = self._search_cache.get(query_vector, cache_scope)
+        if cached is not None:
+            # Callers may mutate result rows; never hand out the cached objects themselves
+            return copy.deepcopy(cached)
+
         try:
             params = {
                 "query_embedding": query_vector,
                 "match_threshold": 0,
                 "match_count": limit,
-                "filter_document_set": document_set if document_set != "all" else None,
+                "filter_document_set": filter_document_set,
+                "ef_search": ef_search,
             }
 
-            response = self.supabase.rpc("match_documents", params)
+            response = await asyncio.to_thread(self.supabase.rpc, "match_documents", params)
             rows = response.data
 
             results = []
@@ -74,6 +121,7 @@ class VectorDBService(
                         "score": float(row.get("similarity", 0)),
                     }
                 )
+            self._search_cache.put(query_vector, copy.deepcopy(results), cache_scope)
             return results
         except Exception as e:
             logger.error(f"Search failed: {e}")
@@ -99,11 +147,7 @@ class VectorDBService(
                 filename = payload.get("filename")
                 content = payload.get("content")
                 doc_set = payload.get("document_set")
-                metadata = {
-                    k: v
-                    for k, v in payload.items()
-                    if k not in ["filename", "content", "document_set"]
-                }
+                metadata = {k: v for k, v in payload.items() if k not in _COLUMN_PAYLOAD_KEYS}
 
                 records.append(
                     {
@@ -116,8 +160,10 @@ class VectorDBService(
                     }
                 )
 
-            response = self.supabase.upsert(self.table_name, records)
-            logger.info(f"Supabase upsert response: {response}")
+            await asyncio.to_thread(self.supabase.upsert, self.table_name, records)
+            self._listing_cache.clear()
+            self._search_cache.clear()
+            logger.info(f"Upserted {len(records)} vectors to {self.table_name}")
         except Exception as e:
             logger.error(f"Upsert failed: {e}")
             raise e
@@ -134,90 +180,164 @@ class VectorDBService(
             # Note: generic delete takes simple filters.
             # If we need complex queries (like 'eq' chaining), we might need to expose builder in service
             # For now, let's assume 'delete' in service handles dict as 'AND' eq filters
-            self.supabase.delete(self.table_name, filters)
+            await asyncio.to_thread(self.supabase.delete, self.table_name, filters)
+            self._listing_cache.clear()
+            self._search_cache.clear()
             logger.info(f"Deleted documents for filename: {filename}")
         except Exception as e:
             logger.error(f"Delete failed: {e}")
             raise e
 
-    async def list_documents(self, limit=1000, offset=0):
+    async def delete_points(self, ids: list[str]):
+        """Delete specific chunks by id, DELETE_BATCH_SIZE ids per request."""
+        if not ids or not self.supabase.is_available():
+            return
+
+        try:
+            for i in range(0, len(ids), DELETE_BATCH_SIZE):
+                batch = list(ids[i : i + DELETE_BATCH_SIZE])
+                await asyncio.to_thread(self.supabase.delete, self.table_name, {"id": batch})
+            self._listing_cache.clear()
+            self._search_cache.clear()
+            logger.info(f"Deleted {len(ids)} points")
+        except Exception as e:
+            logger.error(f"Delete points failed: {e}")
+            raise e
+
+    async def _fetch_documents(
+        self, limit: int, offset: int, columns: str = None
+    ) -> list[DocumentPoint]:
+        """Fetch one page of documents ordered by id; errors propagate to the caller."""
+        response = await asyncio.to_thread(
+            self.supabase.select,
+            self.table_name,
+            columns=columns or DOCUMENT_COLUMNS,
+            range_start=offset,
+            range_end=offset + limit - 1,
+            # Offsets only address the same rows across requests under a fixed order
+            order="id",
+        )
+
+        rows = response.data
+        logger.info(f"list_documents returned {len(rows)} rows (limit={limit}, offset={offset})")
+        results = []
+        for row in rows:
+            payload = {
+                key: row[key] for key in ("content", "filename", "document_set") if key in row
+            }
+            payload.update(row.get("metadata") or {})
+            results.append(DocumentPoint(id=str(row.get("id")), payload=payload))
+        return results
+
+    async def list_documents(self, limit=1000, offset=0, columns: str = None):
+        """
+        List a page of documents.
+
+        Args:
+            limit: Page size
+            offset: Index of the first row
+            columns: Comma-separated columns to fetch (default: DOCUMENT_COLUMNS).
+                Payloads only contain the selected columns, so callers that need
+                a single field avoid transferring chunk content and metadata.
+        """
         if not self.supabase.is_available():
             return []
 
         try:
-            response = self.supabase.select(
-                self.table_name,
-                columns="id, content, filename, document_set, metadata",
-                range_start=offset,
-                range_end=offset + limit - 1,
-            )
-
-            rows = response.data
-            logger.info(
-                f"list_documents returned {len(rows)} rows (limit={limit}, offset={offset})"
-            )
-            results = []
-            for row in rows:
-                payload = {
-                    "content": row.get("content"),
-                    "filename": row.get("filename"),
-                    "document_set": row.get("document_set"),
-                    **(row.get("metadata") or {}),
-                }
-                results.append(DocumentPoint(id=str(row.get("id")), payload=payload))
-            return results
+            return await self._fetch_documents(limit, offset, columns)
         except Exception as e:
             logger.error(f"List documents failed: {e}")
             return []
 
+    async def iter_documents(
+        self, page_size: int = 1000, columns: str = None, prefetch: int = 2
+    ) -> AsyncIterator[DocumentPoint]:
+        """Yield all documents page by page without materializing the whole table.
+
+        Pages are addressed by offset, so up to `prefetch` upcoming pages are fetched
+        concurrently in the background while the current one is consumed.
+        Unlike list_documents, a failed page raises instead of ending the scan early,
+        so callers never mistake a partial scan for the whole table.
+        """
+        if not self.supabase.is_available():
+            return
+
+        pending: deque[asyncio.Task] = deque()
+        next_offset = 0
+
+        def fetch_next() -> None:
+            nonlocal next_offset
+            pending.append(
+                asyncio.create_task(
+                    self._fetch_documents(limit=page_size, offset=next_offset, columns=columns)
+                )
+            )
+            next_offset += page_size
+
+        try:
+            for _ in range(max(1, prefetch)):
+                fetch_next()
+            while pending:
+                page = await pending.popleft()
+                if len(page) < page_size:
+                    # Short page is the last one; later requests can only come back empty
+                    for task in pending:
+                        task.cancel()
+                    pending.clear()
+                else:
+                    fetch_next()
+                for point in page:
+                    yield point
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def get_distinct_document_sets(self) -> list[str]:
-        """Get distinct document_set values from the database."""
+        """Get distinct document_set values, cached for LISTING_CACHE_TTL seconds."""
         if not self.supabase.is_available():
             return []
 
+        cached = self._get_cached_listing("document_sets")
+        if cached is not None:
+            return cached
+
         try:
-            sets = self.supabase.select_distinct(self.table_name, "document_set")
+            response = await asyncio.to_thread(self.supabase.rpc, "distinct_document_sets", {})
+            sets = [row["document_set"] for row in response.data or []]
             logger.info(f"Found {len(sets)} distinct document sets")
-            return sorted(sets)
+            result = sorted(sets)
+            self._set_cached_listing("document_sets", result)
+            return list(result)
         except Exception as e:
             logger.error(f"Get distinct document sets failed: {e}")
             return []
 
     async def get_distinct_filenames(self) -> list[dict[str, Any]]:
-        """Get distinct filenames with their document_set and a sample chunk count."""
+        """
+        Get distinct filenames with their document_set and a sample chunk count.
+        Results are cached for LISTING_CACHE_TTL seconds, or until the next write.
+        """
         if not self.supabase.is_available():
             return []
 
-        try:
-            # Get all distinct filename and document_set combinations
-            response = self.supabase.select(
-                self.table_name,
-                columns="filename, document_set",
-                range_start=0,
-                range_end=9999,  # Large range to get all unique files
-            )
+        cached = self._get_cached_listing("filenames")
+        if cached is not None:
+            return cached
 
-            rows = response.data
-            logger.info(f"Retrieved {len(rows)} rows for filename grouping")
-
-            # Group by filename to count chunks
-            file_groups = {}
-            for row in rows:
-                filename = row.get("filename")
-                document_set = row.get("document_set", "all")
-
-                if filename:
-                    if filename not in file_groups:
-                        file_groups[filename] = {
-                            "filename": filename,
-                            "document_set": document_set,
-                            "chunk_count": 0,
-                        }
-                    file_groups[filename]["chunk_count"] += 1
-
-            result = list(file_groups.values())
+        try:
+            # Aggregated in Postgres: one row per filename rather than per chunk
+            response = await asyncio.to_thread(self.supabase.rpc, "distinct_filenames", {})
+            result = [
+                {
+                    "filename": row["filename"],
+                    "document_set": row.get("document_set"),
+                    "chunk_count": row.get("chunk_count", 0),
+                }
+                for row in response.data or []
+            ]
             logger.info(f"Found {len(result)} distinct filenames")
-            return result
+            self._set_cached_listing("filenames", result)
+            return list(result)
         except Exception as e:
             logger.error(f"Get distinct filenames failed: {e}")
             return []
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from typing import Any
 
 
@@ -7,14 +8,21 @@ class VectorReader(ABC):
 
     @abstractmethod
     async def search(
-        self, query: str, limit: int = 10, document_set: str = None
+        self, query: str, limit: int = 10, document_set: str = None, ef_search: int = None
     ) -> list[dict[str, Any]]:
         """Search for documents similar to query."""
         pass
 
     @abstractmethod
-    async def list_documents(self, limit=1000, offset=0) -> list[Any]:
-        """List all documents."""
+    async def list_documents(self, limit=1000, offset=0, columns: str = None) -> list[Any]:
+        """List all documents, optionally fetching only the given columns."""
+        pass
+
+    @abstractmethod
+    def iter_documents(
+        self, page_size: int = 1000, columns: str = None, prefetch: int = 2
+    ) -> AsyncIterator[Any]:
+        """Iterate over all documents page by page."""
         pass
 
 
@@ -35,6 +43,11 @@ class VectorDeleter(ABC):
         """Delete a document by filename."""
         pass
 
+    @abstractmethod
+    async def delete_points(self, ids: list[str]) -> None:
+        """Delete specific vectors by id."""
+        pass
+
 
 class DocumentMetadataReader(ABC):
     """Interface for reading document metadata."""
@@ -19,6 +19,19 @@ from utils.file_conversion import FileConversionUtils
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_SYSTEM_PROMPT = "You are a helpful assistant that summarizes documents."
+SUMMARY_PROMPT = (
+    "Please provide a concise summary of the following document content "
+    "(converted to markdown):\n\n{content}"
+)
+MAP_SYSTEM_PROMPT = "You are a helpful assistant reading a part of a larger document."
+MAP_PROMPT = "Please provide a concise summary of this section of the document:\n\n{content}"
+REDUCE_SYSTEM_PROMPT = "You are a helpful assistant that consolidates summaries."
+REDUCE_PROMPT = (
+    "Here are summaries of different sections of a document. Please combine them into one "
+    "concise, cohesive summary of the entire document:\n\n{content}"
+)
+
 
 def summarize_document(source: Union[str, BytesIO], filename: str = "document") -> str:
     """
@@ -66,9 +79,9 @@ def summarize_document(source: Union[str, BytesIO], filename: str = "document")
             # Single chunk - standard summary
             agent = Agent(
                 LLMService.get_model(),
-                system_prompt="You are a helpful assistant that summarizes documents.",
+                system_prompt=SUMMARY_SYSTEM_PROMPT,
             )
-            user_msg = f"Please provide a concise summary of the following document content (converted to markdown):\n\n{chunks[0]}"
+            user_msg = SUMMARY_PROMPT.format(content=chunks[0])
 
             result = agent.run_sync(user_msg)
             return result.output
@@ -81,13 +94,13 @@ def summarize_document(source: Union[str, BytesIO], filename: str = "document")
             # Map Step
             map_agent = Agent(
                 LLMService.get_model(),
-                system_prompt="You are a helpful assistant reading a part of a larger document.",
+                system_prompt=MAP_SYSTEM_PROMPT,
             )
 
             chunk_summaries = []
             for i, chunk in enumerate(chunks):
                 try:
-                    user_msg = f"Please provide a concise summary of this section of the document:\n\n{chunk}"
+                    user_msg = MAP_PROMPT.format(content=chunk)
                     chunk_result = map_agent.run_sync(user_msg)
                     chunk_summaries.append(chunk_result.output)
                 except Exception as e:
@@ -99,10 +112,10 @@ def summarize_document(source: Union[str, BytesIO], filename: str = "document")
 
             reduce_agent = Agent(
                 LLMService.get_model(),
-                system_prompt="You are a helpful assistant that consolidates summaries.",
+                system_prompt=REDUCE_SYSTEM_PROMPT,
             )
 
-            reduce_msg = f"Here are summaries of different sections of a document. Please combine them into one concise, cohesive summary of the entire document:\n\n{combined_summaries}"
+            reduce_msg = REDUCE_PROMPT.format(content=combined_summaries)
 
             final_result = reduce_agent.run_sync(reduce_msg)
             return final_result.output
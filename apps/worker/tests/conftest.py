@@ -2,7 +2,7 @@ import asyncio
 import os
 import sys
 import tempfile
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -77,6 +77,7 @@ def mock_openai_agent(mocker):
     mock_result = MagicMock()
     mock_result.output = "Mocked LLM response"
     mock_agent.run_sync.return_value = mock_result
+    mock_agent.run = AsyncMock(return_value=mock_result)
 
     mocker.patch("services.agent.Agent", return_value=mock_agent)
 
@@ -1,7 +1,15 @@
+from unittest.mock import MagicMock
+
 import pytest
 
 import config
-from services.agent import perform_rag, run_sync_agent
+from services.agent import (
+    perform_rag,
+    run_async_agent,
+    run_qa_agent,
+    run_sync_agent,
+    stream_qa_agent,
+)
 
 
 @pytest.mark.unit
@@ -17,6 +25,14 @@ def test_run_sync_agent_no_key(mocker):
     assert "Error: OPENAI_API_KEY not found" in response
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run_async_agent_success(mock_openai_agent):
+    response = await run_async_agent("Hello")
+    assert response == "Mocked LLM response"
+    mock_openai_agent.run_sync.assert_not_called()
+
+
 @pytest.mark.unit
 @pytest.mark.asyncio
 async def test_perform_rag_success(mocker, mock_openai_agent):
@@ -38,3 +54,31 @@ async def test_perform_rag_success(mocker, mock_openai_agent):
     assert result["answer"] == "Mocked LLM response"
     assert len(result["results"]) == 1
     assert result["results"][0]["content"] == "important info"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run_qa_agent_awaits_agent(mock_openai_agent):
+    answer = await run_qa_agent("context", "question?")
+
+    assert answer == "Mocked LLM response"
+    mock_openai_agent.run.assert_awaited_once_with("Context:\ncontext\n\nQuestion: question?")
+    mock_openai_agent.run_sync.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stream_qa_agent_yields_text_deltas(mock_openai_agent):
+    async def stream_text(delta):
+        assert delta is True
+        for chunk in ("The ", "answer", "."):
+            yield chunk
+
+    stream = MagicMock()
+    stream.stream_text = stream_text
+    mock_openai_agent.run_stream.return_value.__aenter__.return_value = stream
+
+    deltas = [delta async for delta in stream_qa_agent("context", "question?")]
+
+    assert deltas == ["The ", "answer", "."]
+    mock_openai_agent.run_stream.assert_called_once_with("Context:\ncontext\n\nQuestion: question?")
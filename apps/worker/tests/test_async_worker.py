@@ -0,0 +1,162 @@
+"""Tests for polling-mode AsyncWorker."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from queue_worker import AsyncWorker
+
+
+@pytest.fixture
+def worker(mocker):
+    mocker.patch("queue_worker.AzureQueueService")
+    mocker.patch("queue_worker.NotificationService")
+    worker = AsyncWorker()
+    worker.polling_interval = 0
+    worker.notification_service.close = AsyncMock()
+    return worker
+
+
+def stop_after_first_batch(worker, messages):
+    """Make receive_messages return one batch, then stop the worker loop."""
+
+    async def receive(**kwargs):
+        worker.running = False
+        return messages
+
+    worker.queue_service.receive_messages = AsyncMock(side_effect=receive)
+    worker.queue_service.delete_message = AsyncMock()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run_processes_batch_concurrently(worker):
+    messages = [MagicMock(id=str(i)) for i in range(3)]
+    stop_after_first_batch(worker, messages)
+
+    started = []
+    all_started = asyncio.Event()
+
+    async def process(message):
+        started.append(message.id)
+        if len(started) == len(messages):
+            all_started.set()
+        # Deadlocks (and times out) if messages are processed one at a time
+        await asyncio.wait_for(all_started.wait(), timeout=1)
+
+    worker.process_message = process
+
+    await worker.run()
+
+    assert sorted(started) == ["0", "1", "2"]
+    assert worker.queue_service.delete_message.await_count == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run_bounds_concurrent_messages(mocker):
+    mocker.patch("queue_worker.AzureQueueService")
+    mocker.patch("queue_worker.NotificationService")
+    mocker.patch("queue_worker.DEFAULT_BATCH_CONCURRENCY", 2)
+    worker = AsyncWorker()
+    worker.notification_service.close = AsyncMock()
+    messages = [MagicMock(id=str(i)) for i in range(5)]
+    stop_after_first_batch(worker, messages)
+
+    in_flight = 0
+    peak = 0
+
+    async def process(message):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    worker.process_message = process
+
+    await worker.run()
+
+    assert peak == 2
+    assert worker.queue_service.delete_message.await_count == 5
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run_failure_does_not_block_other_messages(worker):
+    messages = [MagicMock(id=str(i)) for i in range(3)]
+    stop_after_first_batch(worker, messages)
+    worker.process_message = AsyncMock()
+    worker.queue_service.delete_message = AsyncMock(
+        side_effect=[None, RuntimeError("delete failed"), None]
+    )
+
+    await worker.run()
+
+    assert worker.process_message.await_count == 3
+    assert worker.queue_service.delete_message.await_count == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_shutdown_wakes_idle_worker(worker):
+    worker.polling_interval = 60
+    worker.queue_service.receive_messages = AsyncMock(return_value=[])
+
+    task = asyncio.create_task(worker.run())
+    await asyncio.sleep(0)
+    worker.running = False
+    worker.shutdown_event.set()
+
+    await asyncio.wait_for(task, timeout=1)
+    worker.queue_service.receive_messages.assert_awaited_once()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run_times_out_stuck_message(worker):
+    messages = [
+        MagicMock(id=str(i), content=f'task-{i}|{{"task_type": "ingest", "webhook_url": "hook"}}')
+        for i in range(2)
+    ]
+    stop_after_first_batch(worker, messages)
+    worker.task_timeout = 0.01
+    worker.notification_service.send_webhook = AsyncMock()
+
+    async def execute(payload):
+        await asyncio.Event().wait()
+
+    worker.handlers["ingest"] = MagicMock(execute=execute)
+
+    await asyncio.wait_for(worker.run(), timeout=1)
+
+    assert worker.queue_service.delete_message.await_count == 2
+    assert worker.notification_service.send_webhook.await_count == 2
+    worker.notification_service.send_webhook.assert_any_await(
+        "hook",
+        {
+            "task_id": "task-0",
+            "status": "failed",
+            "error": "Task exceeded timeout of 0.01 seconds",
+        },
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_notification_client_closed_after_in_flight_tasks(worker):
+    messages = [MagicMock(id="0")]
+    stop_after_first_batch(worker, messages)
+    closed_while_processing = []
+
+    async def process(message):
+        await worker.shutdown()
+        closed_while_processing.append(worker.notification_service.close.await_count)
+
+    worker.process_message = process
+
+    await asyncio.wait_for(worker.run(), timeout=5)
+
+    assert closed_while_processing == [0]
+    worker.notification_service.close.assert_awaited_once()
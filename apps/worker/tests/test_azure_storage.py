@@ -0,0 +1,60 @@
+"""Unit tests for Azure blob download helpers."""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from services.azure_storage import azure_storage_service
+
+
+@pytest.fixture
+def temp_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_to_temp_file_keeps_file_on_success(temp_dir, mocker):
+    async def download(blob_path, stream):
+        stream.write(b"data")
+        return 4
+
+    mocker.patch.object(azure_storage_service, "download_to_stream", side_effect=download)
+
+    path = await azure_storage_service.download_to_temp_file("docs/set1/doc.pdf", suffix=".pdf")
+
+    assert path.endswith(".pdf")
+    with open(path, "rb") as f:
+        assert f.read() == b"data"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_to_temp_file_removes_file_on_failure(temp_dir, mocker):
+    mocker.patch.object(azure_storage_service, "download_to_stream", return_value=None)
+
+    assert await azure_storage_service.download_to_temp_file("docs/set1/doc.pdf") is None
+    assert os.listdir(temp_dir) == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_to_temp_file_removes_file_when_cancelled(temp_dir, mocker):
+    started = asyncio.Event()
+
+    async def download(blob_path, stream):
+        started.set()
+        await asyncio.Event().wait()
+
+    mocker.patch.object(azure_storage_service, "download_to_stream", side_effect=download)
+
+    task = asyncio.create_task(azure_storage_service.download_to_temp_file("docs/set1/doc.pdf"))
+    await started.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert os.listdir(temp_dir) == []
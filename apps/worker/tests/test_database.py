@@ -0,0 +1,194 @@
+"""Unit tests for summary persistence helpers."""
+
+import asyncio
+import sys
+import threading
+import time
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def client(mocker):
+    mocker.patch.dict(database._summary_cache, clear=True)
+    mocker.patch.object(database, "_all_summaries_cache", None)
+    client = mocker.patch.object(database.supabase_service, "client")
+    select = client.table.return_value.select.return_value.eq.return_value
+    select.execute.return_value.data = [{"filename": "doc.txt", "summary_text": "old"}]
+    return client
+
+
+@pytest.mark.unit
+def test_get_summary_is_cached(client):
+    first = database.get_summary("doc.txt")
+    second = database.get_summary("doc.txt")
+
+    assert first == second == {"filename": "doc.txt", "summary_text": "old"}
+    client.table.return_value.select.assert_called_once()
+
+
+@pytest.mark.unit
+def test_save_summary_invalidates_cache(client):
+    database.get_summary("doc.txt")
+
+    database.save_summary("doc.txt", "new")
+    database.get_summary("doc.txt")
+
+    assert client.table.return_value.select.call_count == 2
+
+
+@pytest.mark.unit
+def test_get_summary_does_not_cache_misses(client):
+    select = client.table.return_value.select.return_value.eq.return_value
+    select.execute.return_value.data = []
+
+    assert database.get_summary("missing.txt") is None
+    assert "missing.txt" not in database._summary_cache
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_variants_delegate_to_sync_helpers(client):
+    assert await database.aget_summary("doc.txt") == {"filename": "doc.txt", "summary_text": "old"}
+
+    await database.asave_summary("doc.txt", "new")
+
+    assert "doc.txt" not in database._summary_cache
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_variants_are_safe_to_run_concurrently(client):
+    stored = {"summary_text": "v0"}
+    table = client.table.return_value
+
+    def upsert(row, **kwargs):
+        stored["summary_text"] = row["summary_text"]
+        return table.upsert.return_value
+
+    table.upsert.side_effect = upsert
+    table.select.return_value.eq.return_value.execute.side_effect = lambda: type(
+        "Response", (), {"data": [{"filename": "doc.txt", **stored}]}
+    )
+
+    calls = []
+    for i in range(50):
+        calls += [
+            database.aget_summary("doc.txt"),
+            database.aget_all_summaries(),
+            database.asave_summary("doc.txt", f"v{i + 1}"),
+        ]
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert not [r for r in results if isinstance(r, Exception)]
+    # Every save invalidated the cache, so the latest text is what readers see now
+    assert (await database.aget_summary("doc.txt"))["summary_text"] == stored["summary_text"]
+
+
+@pytest.mark.unit
+def test_get_summary_refetches_after_ttl(client, mocker):
+    monotonic = mocker.patch("database.time.monotonic", return_value=100.0)
+    database.get_summary("doc.txt")
+
+    monotonic.return_value = 100.0 + database.SUMMARY_CACHE_TTL
+    database.get_summary("doc.txt")
+
+    assert client.table.return_value.select.call_count == 2
+
+
+@pytest.mark.unit
+def test_get_all_summaries_cached_until_save(client):
+    history = client.table.return_value.select.return_value.order.return_value
+    history.execute.return_value.data = [{"filename": "doc.txt"}]
+
+    assert database.get_all_summaries() == [{"filename": "doc.txt"}]
+    assert database.get_all_summaries() == [{"filename": "doc.txt"}]
+    history.execute.assert_called_once()
+
+    database.save_summary("doc.txt", "new")
+    database.get_all_summaries()
+
+    assert history.execute.call_count == 2
+
+
+@pytest.mark.unit
+def test_save_summaries_bulk_uses_one_upsert(client):
+    database.get_summary("doc.txt")
+
+    database.save_summaries_bulk({"doc.txt": "new", "other.txt": "text"})
+
+    upsert = client.table.return_value.upsert
+    upsert.assert_called_once()
+    rows = upsert.call_args.args[0]
+    assert [(r["filename"], r["summary_text"]) for r in rows] == [
+        ("doc.txt", "new"),
+        ("other.txt", "text"),
+    ]
+    assert upsert.call_args.kwargs == {"on_conflict": "filename"}
+    assert "doc.txt" not in database._summary_cache
+
+
+@pytest.mark.unit
+def test_save_summaries_bulk_skips_empty(client):
+    database.save_summaries_bulk({})
+
+    client.table.assert_not_called()
+
+
+@pytest.mark.unit
+def test_get_all_summaries_omits_summary_text(client):
+    history = client.table.return_value.select.return_value.order.return_value
+    history.execute.return_value.data = []
+
+    database.get_all_summaries()
+
+    client.table.return_value.select.assert_called_once_with("id, filename, created_at")
+
+
+@pytest.mark.unit
+def test_get_summary_does_not_cache_result_read_before_save(client):
+    select = client.table.return_value.select.return_value.eq.return_value
+
+    def execute():
+        # A save lands while this read is in flight
+        database._invalidate_summary_caches("doc.txt")
+        return type("Response", (), {"data": [{"filename": "doc.txt", "summary_text": "old"}]})
+
+    select.execute.side_effect = execute
+    database.get_summary("doc.txt")
+
+    assert "doc.txt" not in database._summary_cache
+
+
+@pytest.mark.unit
+def test_summary_cache_is_thread_safe(client):
+    errors = []
+    stop = time.monotonic() + 1.0
+
+    def read():
+        while time.monotonic() < stop:
+            try:
+                database.get_summary("doc.txt")
+            except Exception as e:  # pragma: no cover - only on regression
+                errors.append(e)
+
+    def invalidate():
+        while time.monotonic() < stop:
+            database._invalidate_summary_caches("doc.txt")
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    threads += [threading.Thread(target=invalidate) for _ in range(2)]
+    # Switch threads as often as possible to surface check-then-act races
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
@@ -0,0 +1,111 @@
+"""Tests for file watcher batching."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from file_watcher import (
+    DebouncedBatcher,
+    FlushingObserver,
+    get_indexed_filenames,
+    iter_unindexed_files,
+)
+
+
+@pytest.mark.unit
+def test_batcher_coalesces_burst_into_single_callback():
+    callback = MagicMock()
+    batcher = DebouncedBatcher(callback, delay=0.05)
+
+    batcher([{"filename": "a.txt"}])
+    batcher([{"filename": "b.txt"}])
+    time.sleep(0.2)
+
+    callback.assert_called_once_with([{"filename": "a.txt"}, {"filename": "b.txt"}])
+
+
+@pytest.mark.unit
+def test_batcher_flush_delivers_pending_immediately():
+    callback = MagicMock()
+    batcher = DebouncedBatcher(callback, delay=10)
+
+    batcher([{"filename": "a.txt"}])
+    batcher.flush()
+
+    callback.assert_called_once_with([{"filename": "a.txt"}])
+
+
+@pytest.mark.unit
+def test_batcher_drops_duplicate_paths_in_batch():
+    callback = MagicMock()
+    batcher = DebouncedBatcher(callback, delay=10)
+
+    batcher([{"filename": "a.txt", "filepath": "a.txt"}])
+    batcher([{"filename": "b.txt", "filepath": "b.txt"}])
+    batcher([{"filename": "a.txt", "filepath": "a.txt"}])
+    batcher.flush()
+
+    callback.assert_called_once_with(
+        [{"filename": "a.txt", "filepath": "a.txt"}, {"filename": "b.txt", "filepath": "b.txt"}]
+    )
+
+
+@pytest.mark.unit
+def test_batcher_logs_callback_errors(caplog):
+    callback = MagicMock(side_effect=RuntimeError("queue down"))
+    batcher = DebouncedBatcher(callback, delay=10)
+
+    batcher([{"filename": "a.txt"}])
+    batcher.flush()
+
+    assert "Error queueing batch of 1 files: queue down" in caplog.text
+
+
+@pytest.mark.unit
+def test_observer_stop_flushes_pending_files(tmp_path):
+    callback = MagicMock()
+    batcher = DebouncedBatcher(callback, delay=10)
+    observer = FlushingObserver(batcher)
+    observer.schedule(MagicMock(), str(tmp_path))
+    observer.start()
+
+    batcher([{"filename": "a.txt"}])
+    observer.stop()
+    observer.join()
+
+    callback.assert_called_once_with([{"filename": "a.txt"}])
+
+
+@pytest.mark.unit
+def test_batcher_flush_without_pending_is_noop():
+    callback = MagicMock()
+    DebouncedBatcher(callback).flush()
+
+    callback.assert_not_called()
+
+
+@pytest.mark.unit
+def test_iter_unindexed_files_skips_dotfiles_empty_and_indexed(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "empty.txt").write_text("")
+    (tmp_path / ".dotfile").write_text("x")
+    (tmp_path / "sub" / "b.txt").write_text("b")
+    (tmp_path / "sub" / "indexed.txt").write_text("c")
+
+    indexed = {str(tmp_path / "sub" / "indexed.txt")}
+    found = sorted(iter_unindexed_files(str(tmp_path), indexed))
+
+    assert found == [str(tmp_path / "a.txt"), str(tmp_path / "sub" / "b.txt")]
+
+
+@pytest.mark.unit
+def test_get_indexed_filenames_reports_failed_scan(mocker):
+    async def failing_pages(**kwargs):
+        yield MagicMock(payload={"filename": "a.txt"})
+        raise RuntimeError("connection reset")
+
+    mocker.patch("file_watcher.db_service.iter_documents", side_effect=failing_pages)
+
+    assert get_indexed_filenames() is None
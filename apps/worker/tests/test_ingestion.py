@@ -0,0 +1,88 @@
+"""Unit tests for IngestionService."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from services.ingestion import IngestionService
+
+
+@pytest.fixture
+def service(mocker):
+    service = IngestionService(batch_size=2)
+
+    pipeline = MagicMock()
+    pipeline.get_pipeline_name.return_value = "standard"
+    doc_result = pipeline.get_converter.return_value.convert.return_value
+    doc_result.document.export_to_markdown.return_value = "markdown"
+    mocker.patch.object(service, "_get_pipeline", return_value=pipeline)
+    mocker.patch.object(service.splitter, "split_text", return_value=["c1", "c2", "c3", "c4", "c5"])
+    return service
+
+
+@pytest.fixture
+def embeddings(mocker):
+    model = MagicMock(spec=["embed_documents"])
+    model.embed_documents.side_effect = lambda texts: [[0.1] for _ in texts]
+    mocker.patch("services.ingestion.LLMService.get_embeddings", return_value=model)
+    return model
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_process_file_embeds_and_upserts_in_batches(service, embeddings, mocker):
+    upsert = mocker.patch("services.ingestion.db_service.upsert_vectors", AsyncMock())
+
+    result = await service.process_file("doc.txt", content=b"text", document_set="set1")
+
+    assert result == "Indexed doc.txt (standard): 5 chunks."
+    assert [call.args[0] for call in embeddings.embed_documents.call_args_list] == [
+        ["c1", "c2"],
+        ["c3", "c4"],
+        ["c5"],
+    ]
+    upserted = [[p["payload"]["content"] for p in call.args[0]] for call in upsert.await_args_list]
+    assert upserted == [["c1", "c2"], ["c3", "c4"], ["c5"]]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_process_file_reports_embedding_failure(service, embeddings, mocker):
+    embeddings.embed_documents.side_effect = RuntimeError("rate limited")
+    upsert = mocker.patch("services.ingestion.db_service.upsert_vectors", AsyncMock())
+
+    result = await service.process_file("doc.txt", content=b"text")
+
+    assert result == "Embedding failed for doc.txt: rate limited"
+    upsert.assert_not_awaited()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_process_file_removes_partial_index_when_later_batch_fails(
+    service, embeddings, mocker
+):
+    embeddings.embed_documents.side_effect = [[[0.1], [0.1]], RuntimeError("rate limited")]
+    upsert = mocker.patch("services.ingestion.db_service.upsert_vectors", AsyncMock())
+    delete_points = mocker.patch("services.ingestion.db_service.delete_points", AsyncMock())
+    delete_document = mocker.patch("services.ingestion.db_service.delete_document", AsyncMock())
+
+    result = await service.process_file("doc.txt", content=b"text", document_set="set1")
+
+    assert result == "Embedding failed for doc.txt: rate limited"
+    upsert.assert_awaited_once()
+    # Only this run's chunks are removed; earlier ingests of the file stay indexed
+    delete_points.assert_awaited_once_with([p["id"] for p in upsert.await_args.args[0]])
+    delete_document.assert_not_awaited()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_process_file_first_batch_failure_has_nothing_to_remove(service, embeddings, mocker):
+    embeddings.embed_documents.side_effect = RuntimeError("rate limited")
+    mocker.patch("services.ingestion.db_service.upsert_vectors", AsyncMock())
+    delete_points = mocker.patch("services.ingestion.db_service.delete_points", AsyncMock())
+
+    await service.process_file("doc.txt", content=b"text")
+
+    delete_points.assert_not_awaited()
@@ -0,0 +1,72 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from services import llm
+from services.llm import LLMService, OpenAIEmbeddings
+
+
+@pytest.fixture
+def embeddings(mocker):
+    client = MagicMock()
+    client.embeddings.create.side_effect = lambda model, input: MagicMock(
+        data=[MagicMock(embedding=[float(len(input[0])), 1.0])]
+    )
+    mocker.patch("services.llm.OpenAI", return_value=client)
+    return OpenAIEmbeddings("test-model", api_key="sk-test")
+
+
+@pytest.mark.unit
+def test_embed_query_reuses_cached_vector(embeddings):
+    first = embeddings.embed_query("hello")
+    second = embeddings.embed_query("hello")
+
+    assert first == second == [5.0, 1.0]
+    assert embeddings.client.embeddings.create.call_count == 1
+
+    # Callers get their own copy
+    first.append(0.0)
+    assert embeddings.embed_query("hello") == [5.0, 1.0]
+
+
+@pytest.mark.unit
+def test_embed_query_evicts_least_recently_used(embeddings, mocker):
+    mocker.patch.object(llm, "QUERY_EMBEDDING_CACHE_SIZE", 2)
+
+    embeddings.embed_query("a")
+    embeddings.embed_query("bb")
+    embeddings.embed_query("a")
+    embeddings.embed_query("ccc")
+
+    assert list(embeddings._query_cache) == ["a", "ccc"]
+    embeddings.embed_query("bb")
+    assert embeddings.client.embeddings.create.call_count == 4
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_model_is_not_shared_between_thread_and_loop(mocker):
+    mocker.patch("services.llm.OpenAIChatModel", side_effect=lambda *a, **k: MagicMock())
+    mocker.patch("services.llm.OpenAIProvider")
+
+    # summarize_document calls run_sync from a worker thread; agents also run on the loop
+    thread_model = await asyncio.to_thread(LLMService.get_model)
+    loop_model = LLMService.get_model()
+
+    assert loop_model is not thread_model
+    assert LLMService.get_model() is loop_model
+    assert await asyncio.to_thread(LLMService.get_model) is not loop_model
+
+
+@pytest.mark.unit
+def test_get_model_reused_within_a_thread(mocker):
+    mocker.patch("services.llm.OpenAIChatModel", side_effect=lambda *a, **k: MagicMock())
+    mocker.patch("services.llm.OpenAIProvider")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        first = executor.submit(LLMService.get_model).result()
+        second = executor.submit(LLMService.get_model).result()
+
+    assert first is second
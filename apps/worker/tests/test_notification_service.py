@@ -0,0 +1,46 @@
+"""Tests for webhook NotificationService."""
+
+import httpx
+import pytest
+
+from queue_worker import NotificationService
+
+
+@pytest.fixture
+def service():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200)
+
+    service = NotificationService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service.requests = requests
+    return service
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_send_webhook_reuses_client(service):
+    client = service._client
+
+    assert await service.send_webhook("https://example.com/hook", {"task_id": "1"})
+    assert await service.send_webhook("https://example.com/hook", {"task_id": "2"})
+
+    assert service._client is client
+    assert [request.content for request in service.requests] == [
+        b'{"task_id":"1"}',
+        b'{"task_id":"2"}',
+    ]
+    await service.close()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_close_discards_client(service):
+    await service.close()
+
+    assert service._client is None
+    assert service._get_client() is not None
+    await service.close()
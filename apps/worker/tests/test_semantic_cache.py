@@ -0,0 +1,52 @@
+"""Unit tests for SemanticCache."""
+
+import pytest
+
+from services.semantic_cache import SemanticCache
+
+
+@pytest.mark.unit
+def test_similar_query_hits():
+    cache = SemanticCache(threshold=0.95)
+    cache.put([1.0, 0.0], ["result"], scope="set1")
+
+    assert cache.get([0.99, 0.05], scope="set1") == ["result"]
+
+
+@pytest.mark.unit
+def test_dissimilar_query_misses():
+    cache = SemanticCache(threshold=0.95)
+    cache.put([1.0, 0.0], ["result"], scope="set1")
+
+    assert cache.get([0.0, 1.0], scope="set1") is None
+
+
+@pytest.mark.unit
+def test_scopes_are_isolated():
+    cache = SemanticCache()
+    cache.put([1.0, 0.0], ["set1 result"], scope="set1")
+
+    assert cache.get([1.0, 0.0], scope="set2") is None
+
+
+@pytest.mark.unit
+def test_expired_entries_miss(mocker):
+    monotonic = mocker.patch("services.semantic_cache.time.monotonic", return_value=0.0)
+    cache = SemanticCache(ttl=10)
+    cache.put([1.0, 0.0], ["result"])
+
+    monotonic.return_value = 10.0
+
+    assert cache.get([1.0, 0.0]) is None
+
+
+@pytest.mark.unit
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticCache(max_entries=2)
+    cache.put([1.0, 0.0, 0.0], ["a"])
+    cache.put([0.0, 1.0, 0.0], ["b"])
+    cache.get([1.0, 0.0, 0.0])
+    cache.put([0.0, 0.0, 1.0], ["c"])
+
+    assert cache.get([1.0, 0.0, 0.0]) == ["a"]
+    assert cache.get([0.0, 1.0, 0.0]) is None
@@ -102,6 +102,7 @@ class TestSingleTaskRunner:
         """Mock notification service."""
         mock_service = MagicMock()
         mock_service.send_webhook = AsyncMock(return_value=True)
+        mock_service.close = AsyncMock()
         mocker.patch(
             "queue_worker.NotificationService",
             return_value=mock_service,
@@ -213,6 +214,73 @@ class TestSingleTaskRunner:
         assert exit_code == 0
         mock_notification_service.send_webhook.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_run_batch_tasks_concurrently(self, mock_handlers, mock_notification_service):
+        """Test batch tasks overlap, bounded by the runner's concurrency."""
+        import asyncio
+
+        running = 0
+        peak = 0
+
+        async def execute(payload):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"status": "completed", "result": "success"}
+
+        mock_handlers["ingest"].execute = execute
+        task_data = json.dumps(
+            [
+                {"task_type": "ingest", "task_id": str(i), "payload": {"filename": f"{i}.pdf"}}
+                for i in range(5)
+            ]
+        )
+
+        runner = SingleTaskRunner(timeout=60, concurrency=2)
+        exit_code = await runner.run(task_data)
+
+        assert exit_code == 0
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_run_batch_task_error_does_not_cancel_others(
+        self, mock_handlers, mock_notification_service
+    ):
+        """Test an unexpected error in one batch task leaves the others running."""
+        sent = []
+
+        async def send_webhook(url, data):
+            if data["task_id"] == "0":
+                raise TypeError("Type is not JSON serializable")
+            sent.append(data["task_id"])
+            return True
+
+        mock_notification_service.send_webhook = send_webhook
+        task_data = json.dumps(
+            [
+                {"task_type": "ingest", "task_id": str(i), "webhook_url": "http://hook"}
+                for i in range(3)
+            ]
+        )
+
+        runner = SingleTaskRunner(timeout=60, concurrency=3)
+        exit_code = await runner.run(task_data)
+
+        assert exit_code == 0
+        assert sorted(sent) == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_run_closes_notification_client(self, mock_handlers, mock_notification_service):
+        """Test the pooled webhook client is closed once the batch finishes."""
+        task_data = json.dumps({"task_type": "ingest", "webhook_url": "http://hook"})
+
+        runner = SingleTaskRunner(timeout=60)
+        await runner.run(task_data)
+
+        mock_notification_service.close.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_run_invalid_task_data(self, mock_handlers, mock_notification_service):
         """Test running with invalid task data returns exit code 1."""
@@ -0,0 +1,109 @@
+"""Tests for SSE connection manager."""
+
+import asyncio
+
+import pytest
+
+from services.sse_manager import SSEConnectionManager, encode_sse_frame
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_broadcast_reaches_all_connections():
+    manager = SSEConnectionManager()
+    await manager.connect("c1", "alice")
+    await manager.connect("c2", "bob")
+
+    await manager.broadcast({"type": "done"})
+
+    assert await manager.listen("c1", "alice") == [encode_sse_frame({"type": "done"})]
+    assert await manager.listen("c2", "bob") == [encode_sse_frame({"type": "done"})]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_listen_drains_pending_messages_in_one_batch():
+    manager = SSEConnectionManager()
+    await manager.connect("c1", "alice")
+
+    await manager.broadcast({"n": 1})
+    await manager.broadcast({"n": 2})
+
+    assert await manager.listen("c1", "alice") == [
+        encode_sse_frame({"n": 1}),
+        encode_sse_frame({"n": 2}),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_user_targeted_broadcast():
+    manager = SSEConnectionManager()
+    await manager.connect("c1", "alice")
+    await manager.connect("c2", "bob")
+
+    await manager.broadcast({"n": 1}, user_id="alice")
+    await manager.broadcast({"n": 2})
+
+    assert await manager.listen("c1", "alice") == [
+        encode_sse_frame({"n": 1}),
+        encode_sse_frame({"n": 2}),
+    ]
+    assert await manager.listen("c2", "bob") == [encode_sse_frame({"n": 2})]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_listen_wakes_on_broadcast():
+    manager = SSEConnectionManager()
+    await manager.connect("c1", "alice")
+
+    listener = asyncio.create_task(manager.listen("c1", "alice"))
+    await asyncio.sleep(0)
+    assert not listener.done()
+
+    await manager.broadcast({"n": 1})
+
+    assert await asyncio.wait_for(listener, timeout=1) == [encode_sse_frame({"n": 1})]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_slow_connection_skips_evicted_messages():
+    manager = SSEConnectionManager(ring_size=2)
+    await manager.connect("c1", "alice")
+
+    for n in range(3):
+        await manager.broadcast({"n": n})
+
+    assert await manager.listen("c1", "alice") == [
+        encode_sse_frame({"n": 1}),
+        encode_sse_frame({"n": 2}),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_listen_returns_only_unread_messages():
+    manager = SSEConnectionManager(ring_size=4)
+    await manager.connect("c1", "alice")
+
+    await manager.broadcast({"n": 1})
+    await manager.broadcast({"n": 2}, user_id="bob")
+    assert await manager.listen("c1", "alice") == [encode_sse_frame({"n": 1})]
+
+    await manager.broadcast({"n": 3})
+    await manager.broadcast({"n": 4}, user_id="alice")
+
+    assert await manager.listen("c1", "alice") == [
+        encode_sse_frame({"n": 3}),
+        encode_sse_frame({"n": 4}),
+    ]
+
+
+@pytest.mark.unit
+def test_encode_sse_frame_uses_type_as_event_name():
+    assert encode_sse_frame({"type": "done", "n": 1}) == (
+        b'event: done\ndata: {"type":"done","n":1}\n\n'
+    )
+    assert encode_sse_frame({"n": 1}) == b'data: {"n":1}\n\n'
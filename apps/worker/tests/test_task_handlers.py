@@ -0,0 +1,65 @@
+"""Tests for ingestion and summarization task handlers."""
+
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+
+from queue_worker import IngestionHandler, SummarizationHandler
+
+
+@pytest.fixture
+def temp_download(mocker, tmp_path):
+    """Make blob downloads land in a real temp file and record the blob path."""
+    path = tmp_path / "download.pdf"
+
+    async def download(blob_path, suffix=""):
+        path.write_bytes(b"pdf")
+        return str(path)
+
+    mock = mocker.patch(
+        "queue_worker.azure_storage_service.download_to_temp_file", side_effect=download
+    )
+    mock.path = path
+    return mock
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ingestion_processes_downloaded_file_by_path(temp_download):
+    handler = IngestionHandler()
+    handler.ingestion_service = AsyncMock()
+    handler.ingestion_service.process_file.return_value = "Indexed"
+
+    result = await handler.execute({"filename": "doc.pdf", "file_url": "docs/set1/doc.pdf"})
+
+    assert result == {"status": "completed", "result": "Indexed"}
+    temp_download.assert_awaited_once_with("docs/set1/doc.pdf", suffix=".pdf")
+    handler.ingestion_service.process_file.assert_awaited_once_with(
+        "doc.pdf", filepath=str(temp_download.path), document_set="default"
+    )
+    assert not os.path.exists(temp_download.path)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_summarization_removes_temp_file(temp_download, mocker):
+    mocker.patch("queue_worker.summarize_document", return_value="Summary")
+
+    result = await SummarizationHandler().execute({"filename": "doc.pdf", "document_set": "s1"})
+
+    assert result == {"status": "completed", "result": "Summary"}
+    assert temp_download.await_args.args[0].endswith("/s1/doc.pdf")
+    assert not os.path.exists(temp_download.path)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ingestion_reports_failed_download(mocker):
+    mocker.patch(
+        "queue_worker.azure_storage_service.download_to_temp_file", AsyncMock(return_value=None)
+    )
+
+    result = await IngestionHandler().execute({"filename": "doc.pdf"})
+
+    assert result == {"status": "failed", "error": "Failed to download file: doc.pdf"}
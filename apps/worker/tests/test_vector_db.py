@@ -0,0 +1,233 @@
+"""Unit tests for VectorDBService."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+import config
+from services.vector_db import DocumentPoint, VectorDBService
+
+
+def make_points(start, count):
+    return [
+        DocumentPoint(id=str(i), payload={"filename": f"f{i}.txt"})
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_documents_pages_until_short_page(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    pages = [make_points(0, 2), make_points(2, 2), make_points(4, 1)]
+    mocker.patch.object(service, "_fetch_documents", AsyncMock(side_effect=pages))
+
+    ids = [point.id async for point in service.iter_documents(page_size=2, prefetch=1)]
+
+    assert ids == ["0", "1", "2", "3", "4"]
+    offsets = [call.kwargs["offset"] for call in service._fetch_documents.await_args_list]
+    assert offsets == [0, 2, 4]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_documents_empty_table(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    mocker.patch.object(service, "_fetch_documents", AsyncMock(return_value=[]))
+
+    assert [point async for point in service.iter_documents(prefetch=1)] == []
+    service._fetch_documents.assert_awaited_once()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_documents_prefetches_next_page(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    pages = [make_points(0, 2), make_points(2, 1)]
+    mocker.patch.object(service, "_fetch_documents", AsyncMock(side_effect=pages))
+
+    documents = service.iter_documents(page_size=2, prefetch=1)
+    first = await anext(documents)
+    await asyncio.sleep(0)
+
+    assert first.id == "0"
+    assert service._fetch_documents.await_count == 2
+    await documents.aclose()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_documents_fetches_pages_concurrently(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    pages = {0: make_points(0, 2), 2: make_points(2, 2), 4: make_points(4, 1), 6: [], 8: []}
+    in_flight = 0
+    peak = 0
+
+    async def fetch_documents(limit, offset, columns):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return pages[offset]
+
+    mocker.patch.object(service, "_fetch_documents", side_effect=fetch_documents)
+
+    ids = [point.id async for point in service.iter_documents(page_size=2, prefetch=3)]
+
+    assert ids == ["0", "1", "2", "3", "4"]
+    assert peak == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_iter_documents_raises_on_failed_page(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    pages = [make_points(0, 2), RuntimeError("connection reset")]
+    mocker.patch.object(service, "_fetch_documents", AsyncMock(side_effect=pages))
+
+    ids = []
+    with pytest.raises(RuntimeError, match="connection reset"):
+        async for point in service.iter_documents(page_size=2, prefetch=1):
+            ids.append(point.id)
+
+    assert ids == ["0", "1"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_documents_projects_selected_columns(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    select = mocker.patch.object(service.supabase, "select")
+    select.return_value.data = [{"id": 1, "filename": "a.txt"}]
+
+    points = await service.list_documents(limit=10, columns="id, filename")
+
+    assert select.call_args.kwargs["columns"] == "id, filename"
+    assert select.call_args.kwargs["order"] == "id"
+    assert points[0].id == "1"
+    assert points[0].payload == {"filename": "a.txt"}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_distinct_document_sets_cached_until_write(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    rpc = mocker.patch.object(service.supabase, "rpc")
+    rpc.return_value.data = [{"document_set": "b"}, {"document_set": "a"}]
+    mocker.patch.object(service.supabase, "delete")
+
+    assert await service.get_distinct_document_sets() == ["a", "b"]
+    assert await service.get_distinct_document_sets() == ["a", "b"]
+    assert rpc.call_count == 1
+
+    await service.delete_document("a.txt")
+    await service.get_distinct_document_sets()
+
+    assert rpc.call_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_distinct_filenames_uses_aggregate_rpc(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    rpc = mocker.patch.object(service.supabase, "rpc")
+    rpc.return_value.data = [{"filename": "a.txt", "document_set": "s1", "chunk_count": 3}]
+
+    assert await service.get_distinct_filenames() == [
+        {"filename": "a.txt", "document_set": "s1", "chunk_count": 3}
+    ]
+    rpc.assert_called_once_with("distinct_filenames", {})
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_passes_ef_search(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    embeddings = mocker.patch("services.vector_db.get_embeddings_model").return_value
+    embeddings.embed_query.return_value = [0.1]
+    rpc = mocker.patch.object(service.supabase, "rpc")
+    rpc.return_value.data = []
+
+    await service.search("query", limit=5)
+    await service.search("query", limit=5, ef_search=128)
+
+    assert rpc.call_args_list[0].args[1]["ef_search"] == config.VECTOR_EF_SEARCH
+    assert rpc.call_args_list[1].args[1]["ef_search"] == 128
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_reuses_results_until_write(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    embeddings = mocker.patch("services.vector_db.get_embeddings_model").return_value
+    embeddings.embed_query.return_value = [0.1, 0.2]
+    rpc = mocker.patch.object(service.supabase, "rpc")
+    rpc.return_value.data = [{"content": "c", "filename": "a.txt", "similarity": 0.9}]
+    mocker.patch.object(service.supabase, "delete")
+
+    first = await service.search("query", document_set="set1")
+    second = await service.search("same query", document_set="set1")
+    await service.search("query", document_set="set2")
+
+    assert first == second
+    assert rpc.call_count == 2
+
+    await service.delete_document("a.txt")
+    await service.search("query", document_set="set1")
+
+    assert rpc.call_count == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_cache_is_isolated_from_caller_mutation(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    embeddings = mocker.patch("services.vector_db.get_embeddings_model").return_value
+    embeddings.embed_query.return_value = [0.1, 0.2]
+    rpc = mocker.patch.object(service.supabase, "rpc")
+    rpc.return_value.data = [{"content": "c", "filename": "a.txt", "similarity": 0.9}]
+
+    first = await service.search("query")
+    first[0]["content"] = "changed"
+    first[0]["metadata"]["filename"] = "changed"
+    second = await service.search("query")
+    second[0]["score"] = 0.0
+    third = await service.search("query")
+
+    assert rpc.call_count == 1
+    assert third == [
+        {
+            "content": "c",
+            "metadata": {"filename": "a.txt", "document_set": None},
+            "score": 0.9,
+        }
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_delete_points_deletes_ids_in_batches(mocker):
+    service = VectorDBService()
+    mocker.patch.object(service.supabase, "is_available", return_value=True)
+    delete = mocker.patch.object(service.supabase, "delete")
+    mocker.patch("services.vector_db.DELETE_BATCH_SIZE", 2)
+
+    await service.delete_points(["a", "b", "c"])
+
+    assert [call.args[1] for call in delete.call_args_list] == [
+        {"id": ["a", "b"]},
+        {"id": ["c"]},
+    ]
@@ -1,10 +1,16 @@
 import re
+from functools import lru_cache
 
+_SET_RE = re.compile(r"[^a-z0-9_]")
 
+
+@lru_cache(maxsize=1024)
 def sanitize_document_set(document_set: str) -> str:
     """
     Sanitize document set name for safe use in file paths and database.
 
+    Results are memoized since the set of document set names is small and bounded.
+
     Args:
         document_set: Raw document set name from user input
 
@@ -13,4 +19,4 @@ def sanitize_document_set(document_set: str) -> str:
     """
     if not document_set:
         return "all"
-    return re.sub(r"[^a-z0-9_]", "_", document_set.lower().strip()).strip("_")
+    return _SET_RE.sub("_", document_set.lower().strip()).strip("_")
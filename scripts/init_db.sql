@@ -14,11 +14,18 @@ create table if not exists documents (
 );
 
 -- Create indexes for faster searching
-create index if not exists documents_vector_idx
+-- The HNSW index stores half-precision (halfvec) copies of the vectors, halving
+-- index memory and the bandwidth spent scoring neighbors. match_documents
+-- rescores the candidates against the full-precision column. Requires pgvector >= 0.7.
+drop index if exists documents_vector_idx;
+create index if not exists documents_vector_halfvec_idx
   on documents
-  using hnsw (vector vector_cosine_ops);
+  using hnsw ((vector::halfvec(768)) halfvec_cosine_ops);
 
-create index if not exists idx_filename on documents (filename);
+-- delete_document filters on filename, optionally narrowed by document_set; the
+-- composite index serves both forms, so the single-column filename index is dropped.
+drop index if exists idx_filename;
+create index if not exists idx_filename_document_set on documents (filename, document_set);
 create index if not exists idx_document_set on documents (document_set);
 
 -- Create the summaries table to store document summaries
@@ -29,15 +36,40 @@ create table if not exists summaries (
   created_at timestamp with time zone default now()
 );
 
+-- created_at is stamped by the database: the column default covers inserts and
+-- this trigger refreshes it when an upsert replaces an existing summary
+create or replace function touch_summary_created_at ()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.created_at = now();
+  return new;
+end;
+$$;
+
+drop trigger if exists summaries_touch_created_at on summaries;
+create trigger summaries_touch_created_at
+  before update on summaries
+  for each row execute function touch_summary_created_at();
+
 -- Create index for faster lookup by filename
 create index if not exists idx_summaries_filename on summaries (filename);
+-- Covers get_all_summaries (newest first, no summary_text) with an index-only scan
+create index if not exists idx_summaries_created_at
+  on summaries (created_at desc) include (id, filename);
 
--- Create the RPC function for similarity search via Supabase REST API
+-- Create the RPC function for similarity search via Supabase REST API.
+-- ef_search sets the HNSW search breadth for this call only: lower is faster,
+-- higher improves recall. Replaces the earlier 4-argument signature so
+-- PostgREST calls stay unambiguous.
+drop function if exists match_documents (vector(768), float, int, text);
 create or replace function match_documents (
   query_embedding vector(768),
   match_threshold float,
   match_count int,
-  filter_document_set text
+  filter_document_set text,
+  ef_search int default 40
 )
 returns table (
   id uuid,
@@ -50,18 +82,61 @@ returns table (
 language plpgsql
 as $$
 begin
+  -- The index scan returns at most ef_search rows, so cover the oversampled candidates
+  perform set_config(
+    'hnsw.ef_search', least(greatest(ef_search, match_count * 2), 1000)::text, true
+  );
+
   return query
+  -- Oversample candidates from the quantized index, then rescore at full precision
+  with candidates as (
+    select
+      documents.id,
+      documents.content,
+      documents.filename,
+      documents.document_set,
+      documents.metadata,
+      documents.vector
+    from documents
+    where filter_document_set is null or documents.document_set = filter_document_set
+    order by documents.vector::halfvec(768) <=> query_embedding::halfvec(768)
+    limit match_count * 2
+  )
   select
-    documents.id,
-    documents.content,
-    documents.filename,
-    documents.document_set,
-    documents.metadata,
-    1 - (documents.vector <=> query_embedding) as similarity
-  from documents
-  where 1 - (documents.vector <=> query_embedding) > match_threshold
-  and (filter_document_set is null or documents.document_set = filter_document_set)
-  order by documents.vector <=> query_embedding
+    candidates.id,
+    candidates.content,
+    candidates.filename,
+    candidates.document_set,
+    candidates.metadata,
+    1 - (candidates.vector <=> query_embedding) as similarity
+  from candidates
+  where 1 - (candidates.vector <=> query_embedding) > match_threshold
+  order by candidates.vector <=> query_embedding
   limit match_count;
 end;
 $$;
+
+-- Distinct listings aggregated in Postgres, so callers receive one row per
+-- file/set instead of paging through every chunk
+create or replace function distinct_filenames ()
+returns table (
+  filename text,
+  document_set text,
+  chunk_count bigint
+)
+language sql stable
+as $$
+  select documents.filename, min(documents.document_set), count(*)
+  from documents
+  where documents.filename is not null
+  group by documents.filename;
+$$;
+
+create or replace function distinct_document_sets ()
+returns table (document_set text)
+language sql stable
+as $$
+  select distinct documents.document_set
+  from documents
+  where documents.document_set is not null;
+$$;